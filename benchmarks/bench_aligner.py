@@ -0,0 +1,54 @@
+"""
+Measure the per-pair overhead of building a fresh SMATCH++ measure for every
+alignment against reusing one Aligner, and the throughput of
+Aligner.compare_many over a process pool.
+
+Usage (from project root):
+    python benchmarks/bench_aligner.py --pairs 200 --nodes 8 --workers 1 2 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from amrsummarizer.smatch_ext import Aligner  # noqa: E402
+from bench_triple_modes import make_pairs  # noqa: E402
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark aligner reuse and batch alignment")
+    p.add_argument("--pairs", type=int, default=200)
+    p.add_argument("--nodes", type=int, default=8)
+    p.add_argument("--solver", default="ilp")
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = p.parse_args()
+
+    pairs = make_pairs(args.pairs, args.nodes)
+
+    t0 = time.perf_counter()
+    for a, b in pairs:
+        Aligner(args.solver, cache=False).compare(a, b)
+    fresh_secs = time.perf_counter() - t0
+
+    aligner = Aligner(args.solver, cache=False)
+    t0 = time.perf_counter()
+    for a, b in pairs:
+        aligner.compare(a, b)
+    reused_secs = time.perf_counter() - t0
+
+    print(f"{args.pairs} pairs, {args.nodes} nodes, solver={args.solver}")
+    print(f"fresh measure per pair : {fresh_secs / args.pairs * 1000:8.2f} ms/pair")
+    print(f"reused Aligner         : {reused_secs / args.pairs * 1000:8.2f} ms/pair")
+    for workers in args.workers:
+        with Aligner(args.solver, workers=workers, cache=False) as batch:
+            batch.compare_many(pairs[:workers])  # start the pool outside the timing
+            t0 = time.perf_counter()
+            batch.compare_many(pairs)
+            secs = time.perf_counter() - t0
+        print(f"compare_many, {workers} workers: {secs / args.pairs * 1000:8.2f} ms/pair")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare decoding every consumer's copy of an AMR with penman.decode against
+decoding it once into a shared ParsedAMR.
+
+Usage (from project root):
+    python benchmarks/bench_amr_graph.py --graphs 500 --nodes 40
+
+A /process_amr request used to decode each graph four times (metrics,
+amr_to_svg, amr2nx and smatch_ext). The script times that pattern against
+decode_amr, and measures the memory held by a batch of penman.Graph objects
+versus the same batch of ParsedAMR objects (symbol tables included).
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import penman
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from amrsummarizer.amr_graph import ParsedAMR, _decode_cached, decode_amr  # noqa: E402
+
+CONSUMERS = 4
+CONCEPTS = ["want-01", "boy", "go-02", "city", "name", "see-01", "girl", "house"]
+ROLES = [":ARG0", ":ARG1", ":ARG2", ":mod", ":location", ":time"]
+
+
+def synthetic_amr(nodes: int, seed: int) -> str:
+    """A chain-shaped AMR with re-entrancies and attributes."""
+    parts, closing = [], 0
+    for i in range(nodes):
+        concept = CONCEPTS[(i + seed) % len(CONCEPTS)]
+        role = ROLES[(i * 7 + seed) % len(ROLES)]
+        prefix = "" if i == 0 else f" {role} "
+        parts.append(f"{prefix}(v{i} / {concept}")
+        if i % 5 == 4:
+            parts.append(f" :quant {i + seed}")
+        if i > 2 and i % 7 == 0:
+            parts.append(f" :ARG0-of v{i - 3}")
+        closing += 1
+    return "".join(parts) + ")" * closing
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    objects = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, objects
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark decode-once AMR graphs")
+    p.add_argument("--graphs", type=int, default=500)
+    p.add_argument("--nodes", type=int, default=40)
+    args = p.parse_args()
+
+    amrs = [synthetic_amr(args.nodes, seed) for seed in range(args.graphs)]
+
+    # Measured first and from an empty decode cache, so each ParsedAMR pays
+    # for its own symbol table
+    _decode_cached.cache_clear()
+    gc.collect()
+    graph_bytes, _ = measure_memory(lambda: [penman.decode(a) for a in amrs])
+    parsed_bytes, _ = measure_memory(lambda: [ParsedAMR(a) for a in amrs])
+
+    t0 = time.perf_counter()
+    for amr in amrs:
+        for _ in range(CONSUMERS):
+            penman.decode(amr).triples
+    legacy_secs = time.perf_counter() - t0
+
+    _decode_cached.cache_clear()
+    t0 = time.perf_counter()
+    for amr in amrs:
+        for _ in range(CONSUMERS):
+            decode_amr(amr).triples
+    shared_secs = time.perf_counter() - t0
+
+    print(f"{args.graphs} graphs x {args.nodes} nodes, {CONSUMERS} consumers per graph")
+    print(f"decode per consumer : {legacy_secs * 1000:8.1f} ms")
+    print(f"decode once, shared : {shared_secs * 1000:8.1f} ms "
+          f"({legacy_secs / shared_secs:.1f}x faster)")
+    print(f"penman.Graph memory : {graph_bytes / args.graphs:8.0f} bytes/graph")
+    print(f"ParsedAMR memory    : {parsed_bytes / args.graphs:8.0f} bytes/graph "
+          f"({graph_bytes / parsed_bytes:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measure how long `import amrsummarizer.main` takes in a fresh interpreter.
+
+Usage (from project root):
+    python benchmarks/bench_import.py --runs 5 --max-seconds 2.0
+
+Exits with status 1 when the median import time exceeds --max-seconds, so it
+can guard against models creeping back into module import time.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["torch", "amrlib", "sentence_transformers", "spacy", "graphviz"]
+
+SNIPPET = (
+    "import sys, time\n"
+    "t0 = time.perf_counter()\n"
+    "import amrsummarizer.main\n"
+    "elapsed = time.perf_counter() - t0\n"
+    "loaded = [m for m in {heavy!r} if m in sys.modules]\n"
+    "print(elapsed, ','.join(loaded))\n"
+)
+
+
+def time_import(src_dir: str):
+    env = dict(os.environ, PYTHONPATH=src_dir)
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, env=env, check=True,
+    ).stdout.split()
+    elapsed = float(out[0])
+    loaded = out[1].split(",") if len(out) > 1 else []
+    return elapsed, loaded
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark amrsummarizer.main import time")
+    p.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    p.add_argument("--max-seconds", type=float, default=None,
+                   help="Fail if the median import time is above this")
+    p.add_argument("--src", default=os.path.join(os.path.dirname(__file__), "..", "src"),
+                   help="Directory containing the amrsummarizer package")
+    args = p.parse_args()
+
+    times, loaded = [], []
+    for _ in range(args.runs):
+        elapsed, loaded = time_import(os.path.abspath(args.src))
+        times.append(elapsed)
+
+    median = statistics.median(times)
+    print(f"import amrsummarizer.main: median {median * 1000:.1f} ms "
+          f"(min {min(times) * 1000:.1f} ms, max {max(times) * 1000:.1f} ms, runs {args.runs})")
+    print(f"heavy modules imported: {', '.join(loaded) if loaded else 'none'}")
+
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"FAIL: median import time above {args.max_seconds:.2f} s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare scoring every (summary, source) pair with the scalar metrics
+against computing the whole N x M matrix at once.
+
+Usage (from project root):
+    python benchmarks/bench_metrics.py --summaries 50 --sources 200 --nodes 20
+
+The scalar loop calls smatch_f1 and is_factually_consistent per pair, which
+rebuilds both triple sets every time; smatch_f1_matrix and coverage_matrix
+encode each AMR once and intersect all pairs in one sparse product.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from amrsummarizer.metrics import (  # noqa: E402
+    coverage_matrix,
+    is_factually_consistent,
+    smatch_f1,
+    smatch_f1_matrix,
+)
+from bench_amr_graph import synthetic_amr  # noqa: E402
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark pairwise vs bulk triple metrics")
+    p.add_argument("--summaries", type=int, default=50)
+    p.add_argument("--sources", type=int, default=200)
+    p.add_argument("--nodes", type=int, default=20)
+    args = p.parse_args()
+
+    summaries = [synthetic_amr(args.nodes // 2, seed) for seed in range(args.summaries)]
+    sources = [synthetic_amr(args.nodes, seed) for seed in range(args.sources)]
+    # Decode up front so both sides time only the metric itself
+    smatch_f1_matrix(summaries, sources)
+
+    t0 = time.perf_counter()
+    f1 = [[smatch_f1(a, b) for b in sources] for a in summaries]
+    coverage = [[is_factually_consistent(a, [b])[1] for b in sources] for a in summaries]
+    scalar_secs = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    f1_matrix = smatch_f1_matrix(summaries, sources)
+    coverage_mat = coverage_matrix(summaries, sources)
+    bulk_secs = time.perf_counter() - t0
+
+    assert np.array_equal(f1_matrix, np.array(f1))
+    assert np.array_equal(coverage_mat, np.array(coverage))
+
+    pairs = args.summaries * args.sources
+    print(f"{args.summaries} summaries x {args.sources} sources ({pairs} pairs), {args.nodes} nodes")
+    print(f"scalar per pair : {scalar_secs * 1000:8.1f} ms")
+    print(f"bulk matrices   : {bulk_secs * 1000:8.1f} ms ({scalar_secs / bulk_secs:.1f}x faster)")
+    print("results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compare the old pydot rendering path of visualizer.render_graph with direct
+DOT emission, and one Graphviz call per graph with one call for many graphs.
+
+Usage (from project root):
+    python benchmarks/bench_render.py --graphs 20 --nodes 300
+
+The pydot path converts the graph with to_pydot, walks its nodes and edges
+again to look up each one in G, and lets pydot write temp files for
+Graphviz. Building the DOT text is timed on its own; the end-to-end SVG
+timings are skipped when the Graphviz `dot` binary is not installed.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import time
+
+from networkx.drawing.nx_pydot import to_pydot
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from amrsummarizer import visualizer  # noqa: E402
+from amrsummarizer.amr2nx import load_amr_graph  # noqa: E402
+from bench_amr_graph import synthetic_amr  # noqa: E402
+
+
+def pydot_graph(G):
+    """The previous render_graph styling pass."""
+    p = to_pydot(G)
+    for node_dot in p.get_nodes():
+        name = node_dot.get_name().strip('"')
+        if name not in G.nodes:
+            continue
+        if G.nodes[name].get("overlap", False):
+            node_dot.set_color("red")
+            node_dot.set_style("filled")
+            node_dot.set_fillcolor("pink")
+        else:
+            node_dot.set_color("grey")
+    for edge_dot in p.get_edges():
+        src = edge_dot.get_source().strip('"')
+        dst = edge_dot.get_destination().strip('"')
+        if not G.has_edge(src, dst):
+            continue
+        if G.edges[src, dst].get("overlap", False):
+            edge_dot.set_color("red")
+            edge_dot.set_penwidth("2")
+        else:
+            edge_dot.set_color("grey")
+            edge_dot.set_penwidth("1")
+    return p
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark AMR overlap SVG rendering")
+    p.add_argument("--graphs", type=int, default=20)
+    p.add_argument("--nodes", type=int, default=300)
+    args = p.parse_args()
+
+    rng = random.Random(0)
+    graphs = []
+    for seed in range(args.graphs):
+        G = load_amr_graph(synthetic_amr(args.nodes, seed))
+        for _, attrs in G.nodes(data=True):
+            attrs["overlap"] = rng.random() < 0.5
+        for _, _, attrs in G.edges(data=True):
+            attrs["overlap"] = rng.random() < 0.5
+        graphs.append(G)
+
+    print(f"{args.graphs} graphs x {args.nodes} nodes")
+    pydot_secs = timed(lambda: [pydot_graph(G).to_string() for G in graphs])
+    direct_secs = timed(lambda: [visualizer.graph_to_dot(G) for G in graphs])
+    print(f"DOT text, pydot round-trip : {pydot_secs / args.graphs * 1000:8.2f} ms/graph")
+    print(f"DOT text, direct emission  : {direct_secs / args.graphs * 1000:8.2f} ms/graph "
+          f"({pydot_secs / direct_secs:.1f}x faster)")
+
+    if shutil.which(visualizer.DOT_BINARY) is None:
+        print("Graphviz `dot` not found; skipping end-to-end SVG timings")
+        return
+    old_secs = timed(lambda: [pydot_graph(G).create(format="svg") for G in graphs])
+    single_secs = timed(lambda: [visualizer.render_svg(G) for G in graphs])
+    many_secs = timed(lambda: visualizer.render_many(graphs))
+    print(f"SVG, pydot + temp files    : {old_secs / args.graphs * 1000:8.2f} ms/graph")
+    print(f"SVG, direct, one call each : {single_secs / args.graphs * 1000:8.2f} ms/graph")
+    print(f"SVG, direct, one call total: {many_secs / args.graphs * 1000:8.2f} ms/graph")
+
+
+if __name__ == "__main__":
+    main()
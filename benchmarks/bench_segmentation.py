@@ -0,0 +1,78 @@
+"""
+Compare the sentence segmentation backends of pipeline.py.
+
+Usage (from project root):
+    python benchmarks/bench_segmentation.py --repeat 20
+
+For every mode the script reports throughput on the bundled corpus
+(benchmarks/data/articles.txt, one article per blank-line separated block),
+both one document at a time and batched through segment_many, plus the
+share of articles whose sentences agree exactly with the reference mode.
+Modes whose model is not installed are reported and skipped.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from amrsummarizer.pipeline import SEGMENTERS, segment_many, segment_sentences  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), "data", "articles.txt")
+
+
+def load_corpus(path: str) -> list[str]:
+    text = open(path, encoding="utf-8").read()
+    return [block.strip() for block in text.split("\n\n") if block.strip()]
+
+
+def bench_mode(mode: str, docs: list[str], repeat: int):
+    segment_many(docs[:1], mode=mode)  # load the pipeline outside the timing
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        single = [segment_sentences(doc, mode=mode) for doc in docs]
+    single_secs = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        batched = segment_many(docs, mode=mode)
+    batched_secs = time.perf_counter() - t0
+
+    assert single == batched
+    return batched, len(docs) * repeat / single_secs, len(docs) * repeat / batched_secs
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark sentence segmentation modes")
+    p.add_argument("--corpus", default=DEFAULT_CORPUS, help="Blank-line separated articles")
+    p.add_argument("--repeat", type=int, default=20, help="Passes over the corpus per mode")
+    p.add_argument("--reference", default="spacy", choices=SEGMENTERS,
+                   help="Mode whose output defines agreement")
+    p.add_argument("--modes", nargs="+", default=list(SEGMENTERS), choices=SEGMENTERS)
+    args = p.parse_args()
+
+    docs = load_corpus(args.corpus)
+    results = {}
+    for mode in args.modes:
+        try:
+            results[mode] = bench_mode(mode, docs, args.repeat)
+        except OSError as e:
+            print(f"{mode:<12} skipped: {e}")
+
+    reference = results.get(args.reference)
+    print(f"{len(docs)} articles x {args.repeat} passes")
+    print(f"{'mode':<12} {'docs/s':>10} {'docs/s pipe':>12} {'sentences':>10} {'agreement':>10}")
+    for mode, (sentences, single_rate, batched_rate) in results.items():
+        count = sum(len(s) for s in sentences)
+        if reference is None:
+            agreement = "n/a"
+        else:
+            same = sum(a == b for a, b in zip(sentences, reference[0]))
+            agreement = f"{same / len(docs):.0%}"
+        print(f"{mode:<12} {single_rate:>10.1f} {batched_rate:>12.1f} {count:>10} {agreement:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare the vectorized top_k_sentences with the original per-sentence loop.
+
+Usage (from project root):
+    python benchmarks/bench_top_k.py --sizes 1000 5000 20000 --dim 384
+
+Embeddings are random float32 vectors with the dimension of all-MiniLM-L6-v2.
+Besides single-summary timings, the batched API is timed for --summaries
+summaries against the same article.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from amrsummarizer.similarity import (  # noqa: E402
+    cosine_similarity,
+    top_k_sentences,
+    top_k_sentences_batch,
+)
+
+
+def legacy_top_k(summary_embedding, sentence_embeddings, sentences, k=3):
+    similarities = [cosine_similarity(summary_embedding, e) for e in sentence_embeddings]
+    top_indices = np.argsort(similarities)[-k:][::-1]
+    return [sentences[i] for i in top_indices], [float(similarities[i]) for i in top_indices]
+
+
+def timeit(fn, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - t0) / repeat, result
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark top-k sentence retrieval")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    p.add_argument("--dim", type=int, default=384)
+    p.add_argument("--k", type=int, default=3)
+    p.add_argument("--summaries", type=int, default=20)
+    p.add_argument("--repeat", type=int, default=5)
+    args = p.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'sentences':>10} {'legacy ms':>10} {'vector ms':>10} {'speedup':>8} "
+          f"{'batch ms/summary':>17} {'same':>5}")
+    for n in args.sizes:
+        article = rng.normal(size=(n, args.dim)).astype(np.float32)
+        summaries = rng.normal(size=(args.summaries, args.dim)).astype(np.float32)
+        sentences = [f"sentence {i}" for i in range(n)]
+
+        legacy_secs, legacy = timeit(
+            lambda: legacy_top_k(summaries[0], article, sentences, args.k), args.repeat)
+        vector_secs, vector = timeit(
+            lambda: top_k_sentences(summaries[0], article, sentences, args.k), args.repeat)
+        batch_secs, _ = timeit(
+            lambda: top_k_sentences_batch(summaries, article, sentences, args.k), args.repeat)
+
+        print(f"{n:>10} {legacy_secs * 1000:>10.2f} {vector_secs * 1000:>10.2f} "
+              f"{legacy_secs / vector_secs:>7.1f}x "
+              f"{batch_secs * 1000 / args.summaries:>17.3f} {str(legacy[0] == vector[0]):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compare the raw and concept-anchored triple modes of metrics.smatch_f1 with
+an ILP alignment (smatch_ext.compare_amr / SMATCH++) on speed and agreement.
+
+Usage (from project root):
+    python benchmarks/bench_triple_modes.py --pairs 100 --nodes 12
+
+Each pair is a synthetic AMR and a copy with renamed variables, a few
+changed concepts and, for a third of the pairs, an unrelated graph. The ILP
+F1 is the reference: the closer a mode's F1 is to it, the better it stands
+in for a full alignment.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from smatchpp import Smatchpp, solvers  # noqa: E402
+
+from amrsummarizer.amr_graph import decode_amr  # noqa: E402
+from amrsummarizer.metrics import smatch_f1  # noqa: E402
+from amrsummarizer.smatch_ext import RawReader, compare_amr  # noqa: E402
+from bench_amr_graph import CONCEPTS, synthetic_amr  # noqa: E402
+
+
+def make_pairs(count: int, nodes: int, seed: int = 0) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    pairs = []
+    for i in range(count):
+        base = synthetic_amr(nodes, i)
+        if i % 3 == 2:
+            other = synthetic_amr(nodes, i + count)
+        else:
+            other = re.sub(r"\bv(\d+)\b", r"w\1", base)
+            for _ in range(rng.randint(0, 2)):
+                old, new = rng.sample(CONCEPTS, 2)
+                other = other.replace(f"/ {old})", f"/ {new})", 1)
+        pairs.append((base, other))
+    return pairs
+
+
+def timed(fn, pairs):
+    t0 = time.perf_counter()
+    scores = np.array([fn(a, b) for a, b in pairs], dtype=float)
+    return scores, time.perf_counter() - t0
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark triple matching modes against ILP alignment")
+    p.add_argument("--pairs", type=int, default=100)
+    p.add_argument("--nodes", type=int, default=12)
+    args = p.parse_args()
+
+    pairs = make_pairs(args.pairs, args.nodes)
+    # Decode up front so the modes time only the matching itself
+    for a, b in pairs:
+        decode_amr(a), decode_amr(b)
+    measure = Smatchpp(alignmentsolver=solvers.ILP(), graph_reader=RawReader(), graph_standardizer=None)
+
+    raw, raw_secs = timed(lambda a, b: smatch_f1(a, b, mode="raw"), pairs)
+    concept, concept_secs = timed(lambda a, b: smatch_f1(a, b, mode="concept"), pairs)
+    ilp, ilp_secs = timed(lambda a, b: measure.score_pair(a, b)["main"]["F1"] / 100, pairs)
+    _, compare_secs = timed(lambda a, b: len(compare_amr(a, b)["common_edges"]), pairs)
+
+    print(f"{args.pairs} pairs, {args.nodes} nodes per graph")
+    print(f"{'mode':<16}{'ms/pair':>10}{'mean |dF1|':>12}{'pearson r':>11}")
+    for name, scores, secs in [("raw", raw, raw_secs), ("concept", concept, concept_secs),
+                               ("ILP (SMATCH++)", ilp, ilp_secs)]:
+        diff = np.abs(scores - ilp).mean()
+        r = np.corrcoef(scores, ilp)[0, 1] if scores.std() > 0 else float("nan")
+        print(f"{name:<16}{secs / args.pairs * 1000:>10.3f}{diff:>12.3f}{r:>11.3f}")
+    print(f"{'compare_amr':<16}{compare_secs / args.pairs * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
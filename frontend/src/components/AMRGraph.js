@@ -1,10 +1,12 @@
 import React from "react";
 import Network from "react-vis-network-graph";
-import { amrToGraph } from "../utils/amrToGraph";
+import { amrToGraph, graphJsonToVis } from "../utils/amrToGraph";
 
-const AMRGraph = ({ amrText }) => {
-  // Convert AMR text into nodes/edges
-  const { nodes, edges } = amrToGraph(amrText);
+const AMRGraph = ({ amrText, graph: graphJson }) => {
+  // Use the server-built graph JSON when given, else parse the AMR text
+  const { nodes, edges } = graphJson
+    ? graphJsonToVis(graphJson)
+    : amrToGraph(amrText);
 
   const graph = { nodes, edges };
 
@@ -49,3 +49,24 @@ export function amrToGraph(amrString) {
 
   return { nodes, edges };
 }
+
+// Convert the node/edge JSON returned by /process_amr with output "graph"
+// into vis-network nodes and edges, highlighting overlapping parts.
+export function graphJsonToVis(graph) {
+  const nodes = graph.nodes.map((node) => ({
+    id: node.id,
+    label: node.label,
+    shape: node.constant ? "box" : "ellipse",
+    color: node.overlap
+      ? { background: "pink", border: "red" }
+      : { background: "#eee", border: "grey" },
+  }));
+  const edges = graph.edges.map((edge) => ({
+    from: edge.source,
+    to: edge.target,
+    label: edge.role,
+    color: edge.overlap ? "red" : "grey",
+    width: edge.overlap ? 2 : 1,
+  }));
+  return { nodes, edges };
+}
@@ -1,10 +1,15 @@
-import penman
 import networkx as nx
 
+try:
+    from .amr_graph import decode_amr
+except ImportError:  # run as a script from this directory
+    from amr_graph import decode_amr
 
-def load_amr_graph(penman_str: str) -> nx.DiGraph:
+
+def load_amr_graph(penman_str) -> nx.DiGraph:
     """
-    Convert a PENMAN-formatted AMR string into a NetworkX DiGraph.
+    Convert a PENMAN-formatted AMR string (or a decoded ParsedAMR)
+    into a NetworkX DiGraph.
 
     Node attributes:
         - label: the concept name (from :instance triples)
@@ -13,8 +18,8 @@ def load_amr_graph(penman_str: str) -> nx.DiGraph:
     Edge attributes:
         - role: the relation label (e.g. ':ARG0', ':mod', etc.)
     """
-    # 1) Decode the PENMAN string into a penman.Graph
-    graph = penman.decode(penman_str)
+    # 1) Decode the PENMAN string once (shared with the other consumers)
+    graph = decode_amr(penman_str)
 
     # 2) Create an empty directed graph
     G = nx.DiGraph()
@@ -0,0 +1,141 @@
+import os
+from array import array
+from functools import lru_cache
+
+import penman
+
+# Number of distinct Penman strings whose decoded graphs are kept around
+DECODE_CACHE_SIZE = int(os.environ.get("AMR_DECODE_CACHE_SIZE", "2048"))
+
+INSTANCE_ROLE = ":instance"
+
+# Every graph keeps its own symbol table, so no symbol outlives the graphs
+# that use it. Id 0 is the instance role and ids 1..n_variables are the
+# graph's variables; concepts, roles and constants come after them, so a
+# concept spelled like a variable (e.g. "i") still gets an id of its own
+INSTANCE_ID = 0
+
+
+class ParsedAMR:
+    """
+    An AMR graph decoded once from Penman notation.
+
+    Triples are kept as a flat array of ids into the graph's own symbol
+    table (source, role, target, source, role, target, ...) instead of
+    tuples of strings, and can be handed to metrics, smatch_ext, amr2nx and
+    the SVG renderer in place of the Penman string. Ids are local to the
+    graph; compare graphs through their string triples.
+
+    As in penman, the variables are the triple sources and the top, and a
+    non-instance triple is an edge when its target is a variable.
+    """
+
+    __slots__ = ("text", "top", "symbols", "n_variables", "triple_ids")
+
+    def __init__(self, penman_str: str, graph: penman.Graph = None):
+        graph = graph if graph is not None else penman.decode(penman_str)
+        self.text = penman_str
+        self.top = graph.top
+        variables = dict.fromkeys(source for source, _, _ in graph.triples)
+        if graph.top is not None:
+            variables.setdefault(graph.top)
+        # Keys are (is_variable, value) so the two namespaces never mix
+        ids = {(False, INSTANCE_ROLE): INSTANCE_ID}
+        for variable in variables:
+            ids[(True, variable)] = len(ids)
+        self.n_variables = len(variables)
+        self.triple_ids = array("I")
+        for source, role, target in graph.triples:
+            target_is_variable = role != INSTANCE_ROLE and target in variables
+            for key in ((True, source), (False, role), (target_is_variable, target)):
+                symbol_id = ids.get(key)
+                if symbol_id is None:
+                    symbol_id = ids[key] = len(ids)
+                self.triple_ids.append(symbol_id)
+        self.symbols = tuple(value for _, value in ids)
+
+    def __len__(self):
+        return len(self.triple_ids) // 3
+
+    def __str__(self):
+        return self.text
+
+    def id_triples(self):
+        """Iterate over (source, role, target) tuples of symbol ids."""
+        ids = self.triple_ids
+        return zip(ids[0::3], ids[1::3], ids[2::3])
+
+    @property
+    def triples(self) -> list[tuple]:
+        """The (source, role, target) string triples, as penman.Graph.triples."""
+        symbols = self.symbols
+        return [(symbols[s], symbols[r], symbols[t]) for s, r, t in self.id_triples()]
+
+    def concept_id_triples(self) -> list[tuple]:
+        """
+        Id triples with every variable replaced by its concept, so graphs
+        that differ only in variable names yield the same triples.
+        Instance triples become (concept, ':instance', concept).
+        """
+        concept_of = {s: t for s, r, t in self.id_triples() if r == INSTANCE_ID}
+        return [
+            (concept_of.get(s, s), r, t if r == INSTANCE_ID else concept_of.get(t, t))
+            for s, r, t in self.id_triples()
+        ]
+
+    def concept_triples(self) -> list[tuple]:
+        """String form of concept_id_triples."""
+        symbols = self.symbols
+        return [(symbols[s], symbols[r], symbols[t]) for s, r, t in self.concept_id_triples()]
+
+    def is_variable_id(self, symbol_id: int) -> bool:
+        return 0 < symbol_id <= self.n_variables
+
+    def variable_ids(self) -> set[int]:
+        return set(range(1, self.n_variables + 1))
+
+    def variables(self) -> set[str]:
+        return {self.symbols[v] for v in self.variable_ids()}
+
+    def instances(self) -> list[tuple]:
+        """(variable, ':instance', concept) triples."""
+        return [t for t in self.triples if t[1] == INSTANCE_ROLE]
+
+    def edges(self) -> list[tuple]:
+        """Relations between two variables."""
+        symbols = self.symbols
+        return [
+            (symbols[s], symbols[r], symbols[t]) for s, r, t in self.id_triples()
+            if r != INSTANCE_ID and self.is_variable_id(t)
+        ]
+
+    def attributes(self) -> list[tuple]:
+        """Relations from a variable to a constant."""
+        symbols = self.symbols
+        return [
+            (symbols[s], symbols[r], symbols[t]) for s, r, t in self.id_triples()
+            if r != INSTANCE_ID and not self.is_variable_id(t)
+        ]
+
+    def to_graph(self) -> penman.Graph:
+        return penman.Graph(self.triples, top=self.top)
+
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _decode_cached(penman_str: str) -> ParsedAMR:
+    return ParsedAMR(penman_str)
+
+
+def decode_amr(amr) -> ParsedAMR:
+    """
+    Return the ParsedAMR for a Penman string, decoding each distinct string once.
+
+    Parameters:
+        amr (str | ParsedAMR): Penman string, or an already decoded graph.
+
+    Returns:
+        ParsedAMR: The decoded graph (shared between callers; do not modify).
+    """
+    if isinstance(amr, ParsedAMR):
+        return amr
+    return _decode_cached(amr)
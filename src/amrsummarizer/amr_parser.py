@@ -1,15 +1,227 @@
-import amrlib
-import penman
-import graphviz
-import torch
+import os
+import json
+import threading
 import gc
 from collections import Counter
+from concurrent.futures import as_completed
 from penman import constant
 
+from .amr_graph import decode_amr
+from .batching import MicroBatcher
+from .cache import LRUCache, TieredCache, make_key
+
+# Location of the stog model; override with the AMR_MODEL_DIR environment variable
+DEFAULT_MODEL_DIR = os.environ.get(
+    "AMR_MODEL_DIR",
+    "/mnt/idms/home/botondbarta/models/model_parse_xfm_bart_large-v0_1_0",
+)
+
+# Maximum number of sentences sent to the model in one forward pass
+DEFAULT_BATCH_SIZE = int(os.environ.get("AMR_PARSE_BATCH_SIZE", "16"))
+
+# Parse cache: in-memory LRU size and optional SQLite file for a persistent tier
+PARSE_CACHE_SIZE = int(os.environ.get("AMR_CACHE_SIZE", "4096"))
+PARSE_CACHE_PATH = os.environ.get("AMR_CACHE_PATH") or None
+
+# Cross-request micro-batching: sentences from concurrent requests are gathered
+# into one batch of up to AMR_SCHEDULER_MAX_BATCH sentences, waiting at most
+# AMR_SCHEDULER_MAX_WAIT_MS. A wait of 0 sends each request straight to the parser.
+SCHEDULER_MAX_BATCH = int(os.environ.get("AMR_SCHEDULER_MAX_BATCH", "32"))
+SCHEDULER_MAX_WAIT_MS = float(os.environ.get("AMR_SCHEDULER_MAX_WAIT_MS", "5"))
+
+# Rendered SVGs kept in memory, keyed by Penman string and style, so a
+# repeated sentence skips Graphviz entirely
+SVG_CACHE_SIZE = int(os.environ.get("AMR_SVG_CACHE_SIZE", "512"))
+
+# Graphviz styling of amr_to_svg: concept nodes, edges and constant nodes
+SVG_NODE_STYLE = {
+    "color": "#3aafa9",
+    "style": "rounded,filled",
+    "shape": "box",
+    "fontcolor": "white",
+}
+SVG_EDGE_STYLE = {"fontsize": "10", "color": "#17252a"}
+SVG_CONSTANT_STYLE = {
+    "shape": "ellipse",
+    "style": "filled,rounded",
+    "fillcolor": "#fe6f5e",
+    "fontcolor": "white",
+}
+
+WARMUP_SENTENCE = "The boy wants to go to New York."
+
+
+class AMRParser:
+    """
+    Long-lived wrapper around an amrlib stog model.
+
+    The model is loaded once (lazily on first use, or eagerly through
+    warmup()) and reused by every call until unload() or reload() is called.
+    All access to the underlying model is serialized through a lock.
+    """
+
+    def __init__(self, model_dir: str = None, batch_size: int = None):
+        self.model_dir = model_dir or DEFAULT_MODEL_DIR
+        self.batch_size = batch_size or DEFAULT_BATCH_SIZE
+        self._stog = None
+        self._lock = threading.RLock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._stog is not None
+
+    def load(self):
+        """Load the stog model if it is not loaded yet and return it."""
+        with self._lock:
+            if self._stog is None:
+                # amrlib pulls in torch and transformers; import it only when needed
+                import amrlib
+
+                self._stog = amrlib.load_stog_model(model_dir=self.model_dir)
+            return self._stog
+
+    def unload(self):
+        """Release the model and free the memory it holds (CPU and GPU)."""
+        with self._lock:
+            if self._stog is None:
+                return
+            self._stog.model.to("cpu")
+            self._stog = None
+            gc.collect()
+
+            import torch
+
+            torch.cuda.empty_cache()
+
+    def reload(self, model_dir: str = None):
+        """Unload the current model and load it again, optionally from a new path."""
+        with self._lock:
+            self.unload()
+            if model_dir:
+                self.model_dir = model_dir
+            return self.load()
+
+    def warmup(self, text: str = WARMUP_SENTENCE):
+        """Load the model and run one parse so the first request pays no setup cost."""
+        self.parse_sents([text])
+
+    def parse_sents(self, texts: list[str]) -> list[str]:
+        """
+        Parse a list of sentences with the loaded model.
+
+        Parameters:
+            texts (List[str]): Sentences to parse.
+
+        Returns:
+            List[str]: One Penman string per input sentence.
+        """
+        with self._lock:
+            stog = self.load()
+            return stog.parse_sents(list(texts))
+
+    def parse_batch(self, texts: list[str], batch_size: int = None) -> list[str]:
+        """
+        Parse many sentences in as few forward passes as possible.
+
+        Inputs are sorted by length and split into chunks of at most
+        batch_size sentences, so each chunk pads to similar lengths.
+        Results are returned in the original input order.
+
+        Parameters:
+            texts (List[str]): Sentences to parse.
+            batch_size (int): Maximum chunk size (defaults to self.batch_size).
+
+        Returns:
+            List[str]: One Penman string per input sentence.
+        """
+        batch_size = batch_size or self.batch_size
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        results = [None] * len(texts)
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            graphs = self.parse_sents([texts[i] for i in chunk])
+            for i, graph in zip(chunk, graphs):
+                results[i] = graph
+        return results
+
+
+_parser = None
+_parser_lock = threading.Lock()
+
+
+def get_parser() -> AMRParser:
+    """Return the process-wide AMRParser, creating it on first use."""
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = AMRParser()
+    return _parser
+
+
+_parse_cache = None
+
+
+def get_parse_cache() -> TieredCache:
+    """Return the process-wide AMR parse cache, creating it on first use."""
+    global _parse_cache
+    if _parse_cache is None:
+        with _parser_lock:
+            if _parse_cache is None:
+                _parse_cache = TieredCache(
+                    PARSE_CACHE_SIZE, PARSE_CACHE_PATH, table="amr_parses"
+                )
+    return _parse_cache
+
+
+_scheduler = None
+
+
+def get_scheduler() -> MicroBatcher:
+    """Return the process-wide micro-batching scheduler in front of the parser."""
+    global _scheduler
+    if _scheduler is None:
+        with _parser_lock:
+            if _scheduler is None:
+                _scheduler = MicroBatcher(
+                    lambda texts: get_parser().parse_batch(texts),
+                    max_batch_size=SCHEDULER_MAX_BATCH,
+                    max_wait_ms=SCHEDULER_MAX_WAIT_MS,
+                )
+    return _scheduler
+
+
+def parse_cache_stats() -> dict:
+    """Hit/miss counters and size of the AMR parse cache."""
+    return get_parse_cache().stats()
+
+
+_svg_cache = None
+
+
+def get_svg_cache() -> LRUCache:
+    """Return the process-wide cache of rendered SVGs, creating it on first use."""
+    global _svg_cache
+    if _svg_cache is None:
+        with _parser_lock:
+            if _svg_cache is None:
+                _svg_cache = LRUCache(SVG_CACHE_SIZE)
+    return _svg_cache
+
+
+def svg_cache_stats() -> dict:
+    """Hit/miss counters and size of the SVG cache."""
+    return get_svg_cache().stats()
+
+
+def normalize_sentence(text: str) -> str:
+    """Collapse runs of whitespace so trivially different inputs share a cache entry."""
+    return " ".join(text.split())
+
 
 def parse_amr(text: str) -> str:
     """
-    Parse the input text into an AMR graph using amrlib's public API.
+    Parse the input text into an AMR graph using the shared AMRParser.
 
     Parameters:
         text (str): The input sentence or text to parse.
@@ -17,31 +229,102 @@ def parse_amr(text: str) -> str:
     Returns:
         str: The raw AMR string in Penman notation.
     """
-    # Load the default stog model (this may take time on the first call)
-    stog = amrlib.load_stog_model(
-        model_dir="/mnt/idms/home/botondbarta/models/model_parse_xfm_bart_large-v0_1_0"
-    )
-    graphs = stog.parse_sents([text])
-    stog.model.to("cpu")
-    del stog
-    gc.collect()
-    torch.cuda.empty_cache()
-    return graphs[0]
+    return parse_amr_batch([text])[0]
 
 
-def amr_to_svg(amr_str: str) -> str:
+def parse_amr_batch(texts: list[str], batch_size: int = None, on_result=None) -> list[str]:
+    """
+    Parse several sentences into AMR graphs with batched model calls.
+
+    Sentences are looked up in the parse cache first (keyed by the normalized
+    text and the model directory); only the misses reach the model. Misses
+    go through the shared micro-batching scheduler, so sentences from
+    concurrent requests share forward passes.
+
+    Parameters:
+        texts (List[str]): The sentences to parse.
+        batch_size (int): Maximum number of sentences per forward pass. When
+            given, the scheduler is bypassed and the misses are parsed directly.
+        on_result (Callable[[int, str], None]): Called with (index, graph) for
+            each text as soon as its graph is available: cache hits first,
+            then misses as their scheduler batch completes.
+
+    Returns:
+        List[str]: Raw AMR strings in Penman notation, in input order.
+    """
+    parser = get_parser()
+    cache = get_parse_cache()
+
+    normalized = [normalize_sentence(text) for text in texts]
+    keys = [make_key(parser.model_dir, text) for text in normalized]
+    results = [cache.get(key) for key in keys]
+
+    missing = {}
+    positions = {}
+    for i, (key, text, graph) in enumerate(zip(keys, normalized, results)):
+        if graph is None:
+            missing.setdefault(key, text)
+            positions.setdefault(key, []).append(i)
+        elif on_result is not None:
+            on_result(i, graph)
+    if not missing:
+        return results
+
+    pending = list(missing.values())
+    if batch_size is None and SCHEDULER_MAX_WAIT_MS > 0:
+        futures = dict(zip(missing, get_scheduler().submit_many(pending)))
+        if on_result is not None:
+            key_of = {future: key for key, future in futures.items()}
+            for future in as_completed(key_of):
+                for i in positions[key_of[future]]:
+                    on_result(i, future.result())
+        graphs = [future.result() for future in futures.values()]
+    else:
+        graphs = parser.parse_batch(pending, batch_size=batch_size)
+        if on_result is not None:
+            for key, graph in zip(missing, graphs):
+                for i in positions[key]:
+                    on_result(i, graph)
+    parsed = dict(zip(missing, graphs))
+    for key, graph in parsed.items():
+        if graph is not None:
+            cache.put(key, graph)
+    return [
+        graph if graph is not None else parsed[key]
+        for key, graph in zip(keys, results)
+    ]
+
+
+def amr_to_svg(amr_str) -> str:
     """
     Convert a Penman AMR string into an SVG image using Graphviz,
     with variable renaming for repeated instances.
 
+    Results are cached by Penman string and style options.
+
     Parameters:
-        amr_str (str): The AMR graph in Penman notation.
+        amr_str (str | ParsedAMR): The AMR graph in Penman notation,
+            or an already decoded graph.
 
     Returns:
         str: The SVG representation of the AMR graph.
     """
-    # Decode the AMR string into a penman.Graph object
-    graph = penman.decode(amr_str)
+    # Decode the AMR string once (shared with the other consumers)
+    graph = decode_amr(amr_str)
+
+    cache = get_svg_cache()
+    style = json.dumps([SVG_NODE_STYLE, SVG_EDGE_STYLE, SVG_CONSTANT_STYLE], sort_keys=True)
+    key = make_key(graph.text, style)
+    svg_str = cache.get(key)
+    if svg_str is None:
+        svg_str = _render_svg(graph)
+        cache.put(key, svg_str)
+    return svg_str
+
+
+def _render_svg(graph) -> str:
+    """Lay out a decoded AMR graph with Graphviz and return the SVG text."""
+    import graphviz
 
     # Optional: Replace numeric attribute values with placeholders
     anon_map = {}
@@ -52,28 +335,24 @@ def amr_to_svg(amr_str: str) -> str:
             anon_map[anon_val] = tgt
             tgt = anon_val
         attributes.append((src, role, tgt))
-    new_graph = penman.Graph(graph.instances() + graph.edges() + attributes)
+    instances = graph.instances()
+    triples = instances + graph.edges() + attributes
 
     # Create a Graphviz Digraph object with custom styling
     dot = graphviz.Digraph(
         format="svg",
-        node_attr={
-            "color": "#3aafa9",
-            "style": "rounded,filled",
-            "shape": "box",
-            "fontcolor": "white",
-        },
-        edge_attr={"fontsize": "10", "color": "#17252a"},
+        node_attr=SVG_NODE_STYLE,
+        edge_attr=SVG_EDGE_STYLE,
     )
 
     # Count occurrences of instance labels for renaming duplicates
-    instance_labels = [t[2] for t in new_graph.triples if t[1] == ":instance"]
+    instance_labels = [t[2] for t in instances]
     label_counts = Counter(instance_labels)
 
     # Build a dictionary mapping variable to a unique display label
     var_to_label = {}
     occurrence_counter = Counter()
-    for var, role, lbl in new_graph.instances():
+    for var, role, lbl in instances:
         if label_counts[lbl] > 1:
             occurrence_counter[lbl] += 1
             var_to_label[var] = f"{lbl} ({occurrence_counter[lbl]})"
@@ -84,7 +363,7 @@ def amr_to_svg(amr_str: str) -> str:
         return var_to_label.get(var, var)
 
     # Add nodes (from :instance triples) and edges for all other triples
-    for src, role, tgt in new_graph.triples:
+    for src, role, tgt in triples:
         if role == ":instance":
             dot.node(src, get_node_name(src))
         else:
@@ -93,14 +372,7 @@ def amr_to_svg(amr_str: str) -> str:
             else:
                 attr_node = f"{src}_{role}_{tgt}"
                 display_val = anon_map.get(tgt, tgt)
-                dot.node(
-                    attr_node,
-                    label=display_val,
-                    shape="ellipse",
-                    style="filled,rounded",
-                    fillcolor="#fe6f5e",
-                    fontcolor="white",
-                )
+                dot.node(attr_node, label=display_val, **SVG_CONSTANT_STYLE)
                 dot.edge(src, attr_node, label=role)
 
     svg_bytes = dot.pipe(format="svg")
@@ -22,41 +22,62 @@ def _get_networkx_edge_representation(align_s, align_t, align_rel):
     return align_s, align_t, align_rel
 
 
-def annotate_overlap(g1, g2, alignment_file):
+def build_edge_index(graph) -> dict:
     """
-    Annotates nodes and edges in NetworkX graphs g1 and g2 with 'overlap':True
-    if they are found to be common based on the alignment_file.
-    Assumes g1 and g2 are NetworkX graphs (can be DiGraph or MultiDiGraph)
-    and that edge relation labels are stored in an attribute named 'role'
-    by the amr2nx.py script.
+    Index the edges of a NetworkX graph by (source, target, role).
+
+    Returns:
+        dict: (source, target, role) -> list of edge keys carrying that role
+        (None entries for graphs that are not multigraphs).
     """
-    with open(alignment_file, 'r', encoding='utf-8') as f:
-        alignment = json.load(f)
+    index = {}
+    if graph.is_multigraph():
+        for u, v, key, role in graph.edges(keys=True, data='role'):
+            index.setdefault((u, v, role), []).append(key)
+    else:
+        for u, v, role in graph.edges(data='role'):
+            index.setdefault((u, v, role), []).append(None)
+    return index
 
-    # Initialize 'overlap' attribute to False for all nodes
-    for node_id in g1.nodes():
-        g1.nodes[node_id]['overlap'] = False
-    for node_id in g2.nodes():
-        g2.nodes[node_id]['overlap'] = False
 
-    # Initialize 'overlap' attribute to False for all edges
-    if g1.is_multigraph():
-        for u, v, key, data_dict in g1.edges(data=True, keys=True):
-            data_dict['overlap'] = False
-    else:
-        for u, v, data_dict in g1.edges(data=True):
-            data_dict['overlap'] = False
+def _reset_overlap(graph):
+    for node_id in graph.nodes():
+        graph.nodes[node_id]['overlap'] = False
+    for _, _, data_dict in graph.edges(data=True):
+        data_dict['overlap'] = False
+
+
+def _mark_indexed_edge(graph, index, source, target, role):
+    for key in index.get((source, target, role), ()):
+        # A caller's index may predate changes to the graph
+        if not graph.has_edge(source, target, *(() if key is None else (key,))):
+            continue
+        edge_data = graph[source][target] if key is None else graph[source][target][key]
+        if edge_data.get('role') == role:
+            edge_data['overlap'] = True
+
+
+def annotate_alignment(g1, g2, alignment, reset=False, index1=None, index2=None):
+    """
+    Annotates nodes and edges in NetworkX graphs g1 and g2 with 'overlap':True
+    from an alignment dict as returned by smatch_ext.compare_amr.
+
+    Only the aligned nodes and edges are touched. Without index1/index2 the
+    edge indexes are built for this call; when annotating the same graphs
+    repeatedly, build them once with build_edge_index and pass them in, so
+    each call takes time linear in the size of the alignment. With
+    reset=True every node and edge first gets 'overlap':False.
+    """
+    if reset:
+        _reset_overlap(g1)
+        _reset_overlap(g2)
+    if index1 is None:
+        index1 = build_edge_index(g1)
+    if index2 is None:
+        index2 = build_edge_index(g2)
 
-    if g2.is_multigraph():
-        for u, v, key, data_dict in g2.edges(data=True, keys=True):
-            data_dict['overlap'] = False
-    else:
-        for u, v, data_dict in g2.edges(data=True):
-            data_dict['overlap'] = False
-    
     # Annotate common nodes
-    common_nodes_list = alignment.get('common_nodes', [])
-    for node_pair in common_nodes_list:
+    for node_pair in alignment.get('common_nodes', []):
         if len(node_pair) >= 2:
             node1_align_var, node2_align_var = node_pair[0], node_pair[1]
             if node1_align_var in g1.nodes:
@@ -65,45 +86,30 @@ def annotate_overlap(g1, g2, alignment_file):
                 g2.nodes[node2_align_var]['overlap'] = True
 
     # Annotate common edges
-    common_edges_list = alignment.get('common_edges', [])
-    for edge_pair_data in common_edges_list:
+    for edge_pair_data in alignment.get('common_edges', []):
         if len(edge_pair_data) >= 2:
             edge_g1_align_data = edge_pair_data[0]
             edge_g2_align_data = edge_pair_data[1]
-            
+
             if len(edge_g1_align_data) == 3 and len(edge_g2_align_data) == 3:
-                s1_align, t1_align, r1_align_surface = edge_g1_align_data
-                s2_align, t2_align, r2_align_surface = edge_g2_align_data
-                
                 # Convert alignment representation to NetworkX representation
-                nx_s1, nx_t1, nx_r1 = _get_networkx_edge_representation(
-                    s1_align, t1_align, r1_align_surface
-                )
-                nx_s2, nx_t2, nx_r2 = _get_networkx_edge_representation(
-                    s2_align, t2_align, r2_align_surface
-                )
-                
+                nx_s1, nx_t1, nx_r1 = _get_networkx_edge_representation(*edge_g1_align_data)
+                nx_s2, nx_t2, nx_r2 = _get_networkx_edge_representation(*edge_g2_align_data)
+
                 # Mark edges as overlapping in both graphs
-                _mark_edge_overlap(g1, nx_s1, nx_t1, nx_r1)
-                _mark_edge_overlap(g2, nx_s2, nx_t2, nx_r2)
+                _mark_indexed_edge(g1, index1, nx_s1, nx_t1, nx_r1)
+                _mark_indexed_edge(g2, index2, nx_s2, nx_t2, nx_r2)
 
 
-def _mark_edge_overlap(graph, source, target, role):
+def annotate_overlap(g1, g2, alignment_file):
     """
-    Mark an edge as overlapping in the given graph.
-    Handles both MultiDiGraph and DiGraph cases.
+    Annotates nodes and edges in NetworkX graphs g1 and g2 with 'overlap':True
+    if they are found to be common based on the alignment_file.
+    Assumes g1 and g2 are NetworkX graphs (can be DiGraph or MultiDiGraph)
+    and that edge relation labels are stored in an attribute named 'role'
+    by the amr2nx.py script. Every other node and edge gets 'overlap':False.
+    See annotate_alignment for in-memory alignments.
     """
-    if not graph.has_edge(source, target):
-        return
-        
-    if graph.is_multigraph():
-        # For MultiDiGraph, find edges with matching role
-        edge_data_dict = graph.get_edge_data(source, target)
-        for key, data in edge_data_dict.items():
-            if data.get('role') == role:
-                data['overlap'] = True
-    else:
-        # For DiGraph, mark the single edge
-        edge_data = graph.get_edge_data(source, target)
-        if edge_data and edge_data.get('role') == role:
-            edge_data['overlap'] = True
\ No newline at end of file
+    with open(alignment_file, 'r', encoding='utf-8') as f:
+        alignment = json.load(f)
+    annotate_alignment(g1, g2, alignment, reset=True)
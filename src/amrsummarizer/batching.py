@@ -0,0 +1,113 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Gather items submitted from many threads into shared batches.
+
+    A single worker thread pulls pending items and calls fn(batch) once per
+    batch. A batch is flushed as soon as it holds max_batch_size items or
+    max_wait_ms has passed since its first item arrived, whichever comes
+    first. Each caller gets a Future resolved with its own result.
+
+    Parameters:
+        fn (Callable[[List], List]): Processes a batch, returning one result per item.
+        max_batch_size (int): Largest batch handed to fn.
+        max_wait_ms (float): Longest time the first item of a batch waits for company.
+    """
+
+    def __init__(self, fn, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item) -> Future:
+        """Queue one item and return a Future for its result."""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((item, future))
+        return future
+
+    def submit_many(self, items) -> list[Future]:
+        """Queue several items and return their Futures in input order."""
+        return [self.submit(item) for item in items]
+
+    def map(self, items) -> list:
+        """Submit items and block until all of their results are available."""
+        return [future.result() for future in self.submit_many(items)]
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "pending": self._queue.qsize(),
+        }
+
+    def close(self):
+        """Stop the worker thread after it drains the items already queued."""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_worker(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="micro-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _next_batch(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    # Deadline passed: only take what is already queued
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Put the stop marker back so the loop exits after this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            items = [item for item, _ in batch]
+            futures = [future for _, future in batch]
+            self.batches += 1
+            self.items += len(items)
+            try:
+                results = self.fn(items)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, result in zip(futures, results):
+                future.set_result(result)
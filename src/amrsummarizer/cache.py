@@ -0,0 +1,263 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def make_key(*parts: str) -> str:
+    """
+    Build a content-addressed cache key from one or more strings.
+
+    Parameters:
+        parts (str): Values identifying the cached item (text, model id, options).
+
+    Returns:
+        str: Hex SHA-256 digest of the joined parts.
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def hash_text(text: str) -> int:
+    """Compact 64-bit content hash of a string, used as a vector cache key."""
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class LRUCache:
+    """
+    Thread-safe, bounded in-memory cache with least-recently-used eviction.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+
+class SQLiteStore:
+    """
+    Persistent key/value store of text values kept in a single SQLite file.
+    """
+
+    def __init__(self, path: str, table: str = "cache"):
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                (key, value),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    """
+    Two-level cache: a bounded in-memory LRU in front of an optional SQLite store.
+
+    Disk hits are promoted into the memory tier. Values must be strings.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: str = None, table: str = "cache"):
+        self.memory = LRUCache(maxsize)
+        self.disk = SQLiteStore(path, table) if path else None
+        self.disk_hits = 0
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+        value = self.disk.get(key)
+        if value is not None:
+            self.disk_hits += 1
+            self.memory.put(key, value)
+        return value
+
+    def put(self, key: str, value: str):
+        self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put(key, value)
+
+    def clear(self):
+        """Clear the memory tier; the disk tier is left untouched."""
+        self.memory.clear()
+
+    def stats(self) -> dict:
+        memory_hits = self.memory.hits
+        hits = memory_hits + self.disk_hits
+        total = memory_hits + self.memory.misses
+        return {
+            "hits": hits,
+            "misses": total - hits,
+            "memory_hits": memory_hits,
+            "disk_hits": self.disk_hits,
+            "hit_ratio": hits / total if total else 0.0,
+            "size": len(self.memory),
+            "maxsize": self.memory.maxsize,
+            "persistent": self.disk is not None,
+        }
+
+
+class VectorCache:
+    """
+    Bounded LRU cache of fixed-size vectors kept in one contiguous array.
+
+    Vectors live in the rows of a single (capacity, dim) matrix of the given
+    dtype; only a key -> row index map is kept per item. The matrix is
+    allocated on the first put, once the vector dimension is known, and
+    doubles in size as needed up to maxsize rows.
+    """
+
+    def __init__(self, maxsize: int = 50000, dtype=np.float32, initial_capacity: int = 1024):
+        self.maxsize = maxsize
+        self.dtype = np.dtype(dtype)
+        self.initial_capacity = initial_capacity
+        self._rows = OrderedDict()
+        self._data = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, keys):
+        """
+        Fetch the cached vectors for keys.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: float32 matrix with one row per
+            key (zeros where missing, None if nothing was ever cached) and a
+            boolean mask of the keys found.
+        """
+        found = np.zeros(len(keys), dtype=bool)
+        with self._lock:
+            if self._data is None:
+                self.misses += len(keys)
+                return None, found
+            out = np.zeros((len(keys), self._data.shape[1]), dtype=np.float32)
+            rows, positions = [], []
+            for i, key in enumerate(keys):
+                row = self._rows.get(key)
+                if row is not None:
+                    self._rows.move_to_end(key)
+                    rows.append(row)
+                    positions.append(i)
+            if rows:
+                out[positions] = self._data[rows]
+                found[positions] = True
+            self.hits += len(rows)
+            self.misses += len(keys) - len(rows)
+        return out, found
+
+    def put_many(self, keys, vectors):
+        """Store one vector per key, evicting the least recently used rows when full."""
+        if self.maxsize <= 0:
+            return
+        vectors = np.asarray(vectors)
+        with self._lock:
+            if self._data is None:
+                capacity = min(self.initial_capacity, self.maxsize)
+                self._data = np.zeros((capacity, vectors.shape[1]), dtype=self.dtype)
+            for key, vector in zip(keys, vectors):
+                row = self._rows.get(key)
+                if row is not None:
+                    self._rows.move_to_end(key)
+                else:
+                    row = self._free_row()
+                    self._rows[key] = row
+                self._data[row] = vector
+
+    def _free_row(self) -> int:
+        size = len(self._rows)
+        if size < self._data.shape[0]:
+            return size
+        if size < self.maxsize:
+            capacity = min(self._data.shape[0] * 2, self.maxsize)
+            grown = np.zeros((capacity, self._data.shape[1]), dtype=self.dtype)
+            grown[:size] = self._data
+            self._data = grown
+            return size
+        # Full: reuse the row of the least recently used entry
+        _, row = self._rows.popitem(last=False)
+        return row
+
+    def __len__(self):
+        return len(self._rows)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "size": len(self._rows),
+            "maxsize": self.maxsize,
+            "dtype": self.dtype.name,
+            "nbytes": self._data.nbytes if self._data is not None else 0,
+        }
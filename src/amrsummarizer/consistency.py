@@ -0,0 +1,86 @@
+from .pipeline import segment_many
+from .embeddings import get_embeddings
+from .similarity import top_k_sentences
+from .amr_parser import parse_amr_batch
+from .metrics import is_factually_consistent, smatch_f1
+
+
+def check_consistency_many(pairs, k: int = 3, threshold: float = 0.8) -> list[dict]:
+    """
+    Run the full consistency check for many (summary, article) pairs.
+
+    The work is batched across pairs: all articles are segmented in one
+    nlp.pipe pass, all summaries and sentences are embedded in one call and
+    every AMR needed by any pair is parsed in one parse_amr_batch call.
+    A pair that cannot be scored gets an "error" entry instead of failing
+    the whole batch.
+
+    Parameters:
+        pairs (List[Tuple[str, str]]): (summary, article) pairs.
+        k (int): Number of article sentences retrieved per summary.
+        threshold (float): Coverage needed to call a summary consistent.
+
+    Returns:
+        List[dict]: One result per pair, in input order, with top_sentences,
+        similarity_scores, consistency_score, is_consistent and smatch_f1
+        (best Smatch-style F1 against any retrieved sentence).
+    """
+    summaries = [summary.strip() for summary, _ in pairs]
+    articles = [article.strip() for _, article in pairs]
+    segmented = segment_many(articles)
+
+    texts = []
+    for summary, sentences in zip(summaries, segmented):
+        texts.append(summary)
+        texts.extend(sentences)
+    embeddings = get_embeddings(texts) if texts else []
+
+    retrieved, offset = [], 0
+    for summary, sentences in zip(summaries, segmented):
+        summary_embedding = embeddings[offset]
+        sentence_embeddings = embeddings[offset + 1:offset + 1 + len(sentences)]
+        offset += 1 + len(sentences)
+        if not summary or not sentences:
+            retrieved.append(None)
+            continue
+        retrieved.append(
+            top_k_sentences(summary_embedding, sentence_embeddings, sentences, k=k)
+        )
+
+    needed = []
+    for summary, hit in zip(summaries, retrieved):
+        if hit is not None:
+            needed.append(summary)
+            needed.extend(hit[0])
+    parsed = dict(zip(needed, parse_amr_batch(needed))) if needed else {}
+
+    results = []
+    for summary, hit in zip(summaries, retrieved):
+        if hit is None:
+            error = "Summary is required." if not summary else "No valid sentences found in the article."
+            results.append({"error": error})
+            continue
+        top_sentences, scores = hit
+        try:
+            summary_amr = parsed[summary]
+            source_amrs = [parsed[sentence] for sentence in top_sentences]
+            is_consistent, consistency_score = is_factually_consistent(
+                summary_amr, source_amrs, threshold=threshold
+            )
+            best_f1 = max(smatch_f1(summary_amr, amr) for amr in source_amrs)
+        except Exception as e:
+            results.append({"error": f"AMR parsing or scoring failed: {e}"})
+            continue
+        results.append({
+            "top_sentences": top_sentences,
+            "similarity_scores": scores,
+            "consistency_score": round(consistency_score, 3),
+            "is_consistent": is_consistent,
+            "smatch_f1": round(best_f1, 3),
+        })
+    return results
+
+
+def check_consistency(summary: str, article: str, k: int = 3, threshold: float = 0.8) -> dict:
+    """Run the full consistency check for a single (summary, article) pair."""
+    return check_consistency_many([(summary, article)], k=k, threshold=threshold)[0]
@@ -1,18 +1,76 @@
-from sentence_transformers import SentenceTransformer
+import os
+import threading
 
-# Load the pre-trained model (this may download the model on first run)
-model = SentenceTransformer("all-MiniLM-L6-v2")
+import numpy as np
+
+from .cache import VectorCache, hash_text
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Embedding cache: number of sentences kept and storage precision (float32/float16)
+EMBEDDING_CACHE_SIZE = int(os.environ.get("AMR_EMBEDDING_CACHE_SIZE", "50000"))
+EMBEDDING_CACHE_DTYPE = os.environ.get("AMR_EMBEDDING_CACHE_DTYPE", "float32")
+
+_cache = VectorCache(EMBEDDING_CACHE_SIZE, dtype=EMBEDDING_CACHE_DTYPE)
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """Return the SentenceTransformer, loading it on first use (may download it)."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from sentence_transformers import SentenceTransformer
+
+                _model = SentenceTransformer(MODEL_NAME)
+    return _model
+
+
+def is_loaded() -> bool:
+    return _model is not None
 
 
 def get_embeddings(sentences):
     """
     Compute embeddings for a list of sentences.
 
+    Sentences already in the embedding cache are served from it; the rest
+    are encoded together in a single model call and added to the cache.
+
     Parameters:
         sentences (List[str]): A list of sentence strings.
 
     Returns:
-        numpy.ndarray: An array of embeddings.
+        numpy.ndarray: A float32 array of embeddings, one row per sentence.
     """
-    embeddings = model.encode(sentences)
+    if len(sentences) == 0:
+        return get_model().encode(sentences)
+
+    keys = [hash_text(sentence) for sentence in sentences]
+    embeddings, found = _cache.lookup(keys)
+    if found.all():
+        return embeddings
+
+    # Encode each distinct missing sentence once
+    missing = {}
+    for i, key in enumerate(keys):
+        if not found[i]:
+            missing.setdefault(key, sentences[i])
+    encoded = np.asarray(get_model().encode(list(missing.values())), dtype=np.float32)
+    _cache.put_many(list(missing), encoded)
+
+    if embeddings is None:
+        embeddings = np.zeros((len(sentences), encoded.shape[1]), dtype=np.float32)
+    rows = {key: row for row, key in enumerate(missing)}
+    for i, key in enumerate(keys):
+        if not found[i]:
+            embeddings[i] = encoded[rows[key]]
     return embeddings
+
+
+def embedding_cache_stats() -> dict:
+    """Hit rate, size and memory use of the sentence-embedding cache."""
+    return _cache.stats()
@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .instrumentation import stage_timer
+
+# Default (workers, queue) per CPU-bound stage, overridable with
+# AMR_<STAGE>_WORKERS and AMR_<STAGE>_QUEUE. Parse workers mostly wait on the
+# micro-batching scheduler, so several of them let concurrent requests share
+# one model batch.
+STAGE_DEFAULTS = {
+    "segment": (2, 32),
+    "embed": (1, 32),
+    "retrieve": (2, 32),
+    "parse": (4, 16),
+    "render": (4, 32),
+}
+
+# Seconds a client is told to wait when a stage is saturated
+RETRY_AFTER_SECONDS = int(os.environ.get("AMR_RETRY_AFTER", "1"))
+
+
+class StageOverloaded(Exception):
+    """Raised when a stage already has as many calls in flight as it accepts."""
+
+    def __init__(self, stage: str, retry_after: int = RETRY_AFTER_SECONDS):
+        super().__init__(f"The {stage} stage is overloaded, retry later.")
+        self.stage = stage
+        self.retry_after = retry_after
+
+
+class StageExecutor:
+    """
+    Dedicated thread pool for one pipeline stage with a bounded backlog.
+
+    At most max_workers calls run at once; up to max_queue more may wait.
+    Beyond that, run() fails fast with StageOverloaded instead of queueing.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.limit = max_workers + max_queue
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix=f"amr-{name}")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) on this stage's pool without blocking the event loop.
+
+        A call counts against the limit until it has finished on the pool,
+        even if the awaiting coroutine is cancelled first.
+        """
+        with self._lock:
+            if self.in_flight >= self.limit:
+                self.rejected += 1
+                raise StageOverloaded(self.name)
+            self.in_flight += 1
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future=None):
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(stage: str) -> StageExecutor:
+    """Return the executor for a stage, creating it from its configuration on first use."""
+    executor = _executors.get(stage)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(stage)
+            if executor is None:
+                workers, backlog = STAGE_DEFAULTS[stage]
+                prefix = f"AMR_{stage.upper()}"
+                executor = StageExecutor(
+                    stage,
+                    int(os.environ.get(f"{prefix}_WORKERS", workers)),
+                    int(os.environ.get(f"{prefix}_QUEUE", backlog)),
+                )
+                _executors[stage] = executor
+    return executor
+
+
+async def run_stage(stage: str, fn, *args, **kwargs):
+    """
+    Run a CPU-bound call on the dedicated executor of the given stage.
+    The time spent, queueing included, is recorded as a run of that stage.
+    """
+    with stage_timer(stage):
+        return await get_executor(stage).run(fn, *args, **kwargs)
+
+
+def executor_stats() -> dict:
+    return {stage: executor.stats() for stage, executor in _executors.items()}
+
+
+def shutdown_executors():
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown()
+        _executors.clear()
@@ -0,0 +1,40 @@
+from .amr_graph import INSTANCE_ROLE, decode_amr
+from .metrics import list_triples
+
+
+def amr_to_graph_json(amr, matched: set = None, mode: str = None) -> dict:
+    """
+    Build a compact node/edge description of an AMR for client-side drawing.
+
+    Concepts become nodes keyed by their variable; constants (attribute
+    values) become their own nodes, one per attribute, as in amr_to_svg.
+    A node or edge is marked "overlap" when its triple is in `matched`,
+    compared the same way as the metrics (see metrics.list_triples).
+
+    Parameters:
+        amr (str | ParsedAMR): The AMR graph in Penman notation, or an
+            already decoded graph.
+        matched (Set[tuple]): Triples found in the other graph(s), e.g.
+            metrics.extract_triples of the source AMRs.
+        mode (str): Triple mode used for matching, one of metrics.TRIPLE_MODES.
+
+    Returns:
+        dict: {"top": variable, "nodes": [{"id", "label", "constant",
+        "overlap"}], "edges": [{"source", "target", "role", "overlap"}]}.
+    """
+    graph = decode_amr(amr)
+    matched = matched or set()
+    variables = graph.variables()
+
+    nodes, edges = [], []
+    for (src, role, tgt), key in zip(graph.triples, list_triples(graph, mode)):
+        overlap = key in matched
+        if role == INSTANCE_ROLE:
+            nodes.append({"id": src, "label": tgt, "constant": False, "overlap": overlap})
+        elif tgt in variables:
+            edges.append({"source": src, "target": tgt, "role": role, "overlap": overlap})
+        else:
+            constant_id = f"{src}_{role}_{tgt}"
+            nodes.append({"id": constant_id, "label": tgt, "constant": True, "overlap": overlap})
+            edges.append({"source": src, "target": constant_id, "role": role, "overlap": overlap})
+    return {"top": graph.top, "nodes": nodes, "edges": edges}
@@ -0,0 +1,154 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Per-request stage durations, filled in while a request is being handled
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets, in Prometheus form."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """(le, count) pairs including the +Inf bucket."""
+        total, rows = 0, []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            rows.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return rows
+
+
+class Metrics:
+    """
+    Process-wide request and stage metrics: latency histograms per stage and
+    per endpoint, request counts by status and a gauge of requests in flight.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage_seconds = {}
+        self.request_seconds = {}
+        self.requests = {}
+        self.in_flight = 0
+
+    def observe_stage(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self.stage_seconds.get(stage)
+            if histogram is None:
+                histogram = self.stage_seconds[stage] = Histogram()
+            histogram.observe(seconds)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+    def request_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self, endpoint: str, status: int, seconds: float):
+        with self._lock:
+            self.in_flight -= 1
+            key = (endpoint, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            histogram = self.request_seconds.get(endpoint)
+            if histogram is None:
+                histogram = self.request_seconds[endpoint] = Histogram()
+            histogram.observe(seconds)
+
+    def render(self, caches: dict = None, executors: dict = None) -> str:
+        """
+        Prometheus text exposition of the collected metrics.
+
+        Parameters:
+            caches (Dict[str, dict]): Cache name -> stats() with hits/misses/hit_ratio/size.
+            executors (Dict[str, dict]): Stage -> StageExecutor.stats().
+        """
+        lines = []
+        with self._lock:
+            _histogram_lines(lines, "amr_stage_seconds", "Pipeline stage latency", "stage",
+                             self.stage_seconds)
+            _histogram_lines(lines, "amr_request_seconds", "Request latency", "endpoint",
+                             self.request_seconds)
+            lines.append("# HELP amr_requests_total Requests handled, by endpoint and status")
+            lines.append("# TYPE amr_requests_total counter")
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(f'amr_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+            lines.append("# HELP amr_requests_in_flight Requests currently being handled")
+            lines.append("# TYPE amr_requests_in_flight gauge")
+            lines.append(f"amr_requests_in_flight {self.in_flight}")
+
+        if caches:
+            for name, help_text, key in (
+                ("amr_cache_hits_total", "Cache hits", "hits"),
+                ("amr_cache_misses_total", "Cache misses", "misses"),
+                ("amr_cache_hit_ratio", "Cache hit ratio", "hit_ratio"),
+                ("amr_cache_entries", "Entries held in the cache", "size"),
+            ):
+                kind = "counter" if name.endswith("_total") else "gauge"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for cache, stats in sorted(caches.items()):
+                    lines.append(f'{name}{{cache="{cache}"}} {stats[key]}')
+        if executors:
+            lines.append("# HELP amr_stage_in_flight Calls running or queued on a stage executor")
+            lines.append("# TYPE amr_stage_in_flight gauge")
+            for stage, stats in sorted(executors.items()):
+                lines.append(f'amr_stage_in_flight{{stage="{stage}"}} {stats["in_flight"]}')
+            lines.append("# HELP amr_stage_rejected_total Calls rejected because a stage was saturated")
+            lines.append("# TYPE amr_stage_rejected_total counter")
+            for stage, stats in sorted(executors.items()):
+                lines.append(f'amr_stage_rejected_total{{stage="{stage}"}} {stats["rejected"]}')
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(lines: list, name: str, help_text: str, label: str, histograms: dict):
+    lines.append(f"# HELP {name} {help_text} in seconds")
+    lines.append(f"# TYPE {name} histogram")
+    for value, histogram in sorted(histograms.items()):
+        for le, count in histogram.cumulative():
+            lines.append(f'{name}_bucket{{{label}="{value}",le="{le}"}} {count}')
+        lines.append(f'{name}_sum{{{label}="{value}"}} {histogram.sum}')
+        lines.append(f'{name}_count{{{label}="{value}"}} {histogram.count}')
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time the enclosed block as one run of `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe_stage(stage, time.perf_counter() - start)
+
+
+def start_request_timings() -> dict:
+    """Begin collecting per-stage durations for the current request."""
+    timings = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def format_timings(timings: dict, total: float) -> str:
+    """Server-Timing style breakdown in milliseconds, e.g. "parse;dur=41.2, total;dur=80.3"."""
+    parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
@@ -0,0 +1,232 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import make_key
+
+# SQLite file holding job status and results, and the number of background
+# threads running queued jobs
+JOB_DB_PATH = os.environ.get("AMR_JOB_DB", "amr_jobs.sqlite3")
+JOB_WORKERS = int(os.environ.get("AMR_JOB_WORKERS", "1"))
+
+# Seconds a runner holds a claimed job without renewing it; a job whose
+# lease has run out (its process died) can be claimed by another runner
+JOB_LEASE_SECONDS = float(os.environ.get("AMR_JOB_LEASE", "60"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def job_id(summary: str, article: str, **options) -> str:
+    """Content hash identifying a job: identical requests share one job."""
+    return make_key("job", summary, article, json.dumps(options, sort_keys=True))
+
+
+class JobStore:
+    """
+    Job records (inputs, status, result) in a SQLite table, so status
+    survives restarts and unfinished jobs can be resumed. Several processes
+    may share one file: a job is only run after claim() succeeds.
+    """
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, payload TEXT NOT NULL, "
+                "result TEXT, error TEXT, created REAL NOT NULL, updated REAL NOT NULL, "
+                "lease_until REAL)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "lease_until" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+
+    def create(self, job_id: str, payload: dict) -> bool:
+        """
+        Queue a job unless one with this id exists; a failed job is queued again.
+
+        Returns:
+            bool: True if the job was (re)queued and needs to be run.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is not None and row[0] != FAILED:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, status, payload, result, error, created, updated) "
+                "VALUES (?, ?, ?, NULL, NULL, ?, ?)",
+                (job_id, QUEUED, json.dumps(payload), now, now),
+            )
+        return True
+
+    def claim(self, job_id: str, lease: float = JOB_LEASE_SECONDS) -> bool:
+        """
+        Atomically mark a queued job, or a running job whose lease expired,
+        as running for the next `lease` seconds.
+
+        Returns:
+            bool: True if this caller now owns the job and should run it.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, lease_until = ?, updated = ? WHERE id = ? "
+                "AND (status = ? OR (status = ? AND COALESCE(lease_until, 0) < ?))",
+                (RUNNING, now + lease, now, job_id, QUEUED, RUNNING, now),
+            )
+        return cursor.rowcount == 1
+
+    def renew(self, job_ids, lease: float = JOB_LEASE_SECONDS):
+        """Extend the lease of jobs this caller is still running."""
+        until = time.time() + lease
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND status = ?",
+                [(until, job_id, RUNNING) for job_id in job_ids],
+            )
+
+    def update(self, job_id: str, status: str, result: dict = None, error: str = None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id),
+            )
+
+    def get(self, job_id: str):
+        """Return the job as a dict (without its inputs), or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, result, error, created, updated FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, result, error, created, updated = row
+        job = {"job_id": job_id, "status": status, "created": created, "updated": updated}
+        if result is not None:
+            job["result"] = json.loads(result)
+        if error is not None:
+            job["error"] = error
+        return job
+
+    def payload(self, job_id: str) -> dict:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0])
+
+    def unfinished(self) -> list[str]:
+        """Ids of jobs that were queued or running, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created", (QUEUED, RUNNING)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def claimable(self) -> list[str]:
+        """Ids of queued jobs and of running jobs with an expired lease, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? "
+                "OR (status = ? AND COALESCE(lease_until, 0) < ?) ORDER BY created",
+                (QUEUED, RUNNING, time.time()),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JobRunner:
+    """
+    Runs queued jobs on background threads and records their outcome.
+
+    `fn(**payload)` does the work; a result dict with an "error" key, or an
+    exception, marks the job failed. A job is claimed atomically before it
+    runs, so runners in several processes sharing one store never run it
+    twice. Running jobs have their lease renewed; queued jobs and jobs whose
+    lease expired (their process died) are picked up at start and then
+    every lease/3 seconds.
+    """
+
+    def __init__(self, store: JobStore, fn, workers: int = JOB_WORKERS,
+                 lease: float = JOB_LEASE_SECONDS):
+        self.store = store
+        self.fn = fn
+        self.lease = lease
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="amr-job")
+        self._lock = threading.Lock()
+        self._scheduled = set()
+        self._running = set()
+        self._stopped = threading.Event()
+        self._schedule_claimable()
+        self._heartbeat = threading.Thread(
+            target=self._keep_leases, name="amr-job-lease", daemon=True
+        )
+        self._heartbeat.start()
+
+    def submit(self, payload: dict) -> dict:
+        """Queue a job for this payload, reusing an existing job with the same content."""
+        new_id = job_id(**payload)
+        if self.store.create(new_id, payload):
+            self._schedule(new_id)
+        return self.store.get(new_id)
+
+    def _schedule(self, run_id: str):
+        with self._lock:
+            if run_id in self._scheduled or run_id in self._running:
+                return
+            self._scheduled.add(run_id)
+        try:
+            self._pool.submit(self._run, run_id)
+        except RuntimeError:  # shut down meanwhile
+            with self._lock:
+                self._scheduled.discard(run_id)
+
+    def _schedule_claimable(self):
+        for pending_id in self.store.claimable():
+            self._schedule(pending_id)
+
+    def _keep_leases(self):
+        while not self._stopped.wait(self.lease / 3):
+            with self._lock:
+                running = list(self._running)
+            try:
+                self.store.renew(running, self.lease)
+                self._schedule_claimable()
+            except sqlite3.OperationalError:
+                continue  # database busy; retry on the next beat
+
+    def _run(self, run_id: str):
+        with self._lock:
+            self._scheduled.discard(run_id)
+        if not self.store.claim(run_id, self.lease):
+            return  # finished, or owned by another runner
+        with self._lock:
+            self._running.add(run_id)
+        try:
+            result = self.fn(**self.store.payload(run_id))
+        except Exception as e:
+            self.store.update(run_id, FAILED, error=str(e))
+            return
+        finally:
+            with self._lock:
+                self._running.discard(run_id)
+        if "error" in result:
+            self.store.update(run_id, FAILED, error=result["error"])
+        else:
+            self.store.update(run_id, DONE, result=result)
+
+    def shutdown(self, wait: bool = False):
+        self._stopped.set()
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
@@ -1,15 +1,135 @@
-from fastapi import FastAPI, HTTPException
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from typing import Dict
 
-from .models import TextInput
+from . import pipeline, embeddings
+from .models import BatchInput, TextInput
 from .pipeline import segment_sentences
 from .embeddings import get_embeddings
-from .similarity import top_k_sentences
-from .amr_parser import parse_amr, amr_to_svg
-from .metrics import is_factually_consistent
+from .similarity import top_k_sentences, top_k_sentences_batch
+from .sentence_index import SentenceIndex
+from .amr_parser import parse_amr_batch, amr_to_svg, get_parser, parse_cache_stats, svg_cache_stats
+from .metrics import extract_triples, is_factually_consistent
+from .graph_json import amr_to_graph_json
+from .executors import StageOverloaded, executor_stats, run_stage, shutdown_executors
+from .consistency import check_consistency
+from .jobs import JOB_DB_PATH, JobRunner, JobStore
+from .instrumentation import format_timings, metrics, stage_timer, start_request_timings
+
+# Set AMR_WARMUP=0 to skip loading the models when the server starts;
+# they are then loaded lazily by the first request that needs them
+WARMUP_ON_STARTUP = os.environ.get("AMR_WARMUP", "1") != "0"
+
+# Optional pre-built SentenceIndex directory; when set, /process_article also
+# retrieves evidence sentences from that corpus
+SENTENCE_INDEX_PATH = os.environ.get("AMR_SENTENCE_INDEX") or None
+
+# Articles submitted through /jobs run in the background and may be much
+# longer than the synchronous endpoints accept
+MAX_JOB_ARTICLE_LENGTH = int(os.environ.get("AMR_MAX_JOB_ARTICLE_LENGTH", "1000000"))
+
+# Set AMR_TIMING_HEADER=1 to send the X-Timing stage breakdown with every
+# response; otherwise only requests carrying an X-Timing header get it
+TIMING_HEADER_ALWAYS = os.environ.get("AMR_TIMING_HEADER", "0") == "1"
+
+logger = logging.getLogger(__name__)
+
+_sentence_index = None
+_sentence_index_lock = threading.Lock()
+_job_runner = None
+_job_runner_lock = threading.Lock()
+_warmup_future = None
+_warmup_error = None
+
+
+def get_sentence_index():
+    """Return the configured corpus index (memory-mapped on first use), or None."""
+    global _sentence_index
+    if _sentence_index is None and SENTENCE_INDEX_PATH:
+        with _sentence_index_lock:
+            if _sentence_index is None:
+                _sentence_index = SentenceIndex.load(SENTENCE_INDEX_PATH)
+    return _sentence_index
+
+
+def get_job_runner() -> JobRunner:
+    """Return the background job runner, opening the job store on first use."""
+    global _job_runner
+    if _job_runner is None:
+        with _job_runner_lock:
+            if _job_runner is None:
+                _job_runner = JobRunner(JobStore(JOB_DB_PATH), check_consistency)
+    return _job_runner
+
+
+def warm_up_models():
+    """Load spaCy, the sentence encoder, the AMR parser and the sentence index."""
+    pipeline.load()
+    embeddings.get_model()
+    get_parser().warmup()
+    get_sentence_index()
+
+
+def _warmup_done(future):
+    """Log a failed warm-up and keep its error for /ready."""
+    global _warmup_error
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        _warmup_error = f"{type(error).__name__}: {error}"
+        logger.error("Model warm-up failed", exc_info=error)
+
+
+def model_status() -> Dict[str, bool]:
+    status = {
+        "segmenter": pipeline.is_loaded(),
+        "embedder": embeddings.is_loaded(),
+        "amr_parser": get_parser().is_loaded,
+    }
+    if SENTENCE_INDEX_PATH:
+        status["sentence_index"] = _sentence_index is not None
+    return status
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the models in the background so /ping answers right away
+    # while /ready reports when requests will only pay for inference
+    global _warmup_future, _job_runner
+    if WARMUP_ON_STARTUP:
+        _warmup_future = asyncio.get_running_loop().run_in_executor(None, warm_up_models)
+        _warmup_future.add_done_callback(_warmup_done)
+    # Open the job store now so jobs left unfinished by a previous run resume
+    get_job_runner()
+    yield
+    with _job_runner_lock:
+        if _job_runner is not None:
+            _job_runner.shutdown()
+            _job_runner = None
+    shutdown_executors()
+    get_parser().unload()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.exception_handler(StageOverloaded)
+async def stage_overloaded_handler(request: Request, exc: StageOverloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
-app = FastAPI()
 
 origins = [
     "http://localhost:3000",
@@ -27,11 +147,58 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    Count and time every request by route, and collect its per-stage
+    timings for the optional X-Timing header. For streamed responses the
+    header only covers the work done before the stream starts.
+    """
+    timings = start_request_timings()
+    start = time.perf_counter()
+    metrics.request_started()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        elapsed = time.perf_counter() - start
+        route = request.scope.get("route")
+        # Label by route template so /jobs/{job_id} is one series
+        metrics.request_finished(route.path if route is not None else "unmatched", status, elapsed)
+    if TIMING_HEADER_ALWAYS or "x-timing" in request.headers:
+        response.headers["X-Timing"] = format_timings(timings, elapsed)
+    return response
+
+
 @app.get("/ping")
 def ping():
     return {"message": "Pong!"}
 
 
+@app.get("/ready")
+def ready():
+    status = model_status()
+    body = {"ready": all(status.values()), "models": status}
+    if _warmup_error is not None:
+        body["error"] = _warmup_error
+    return JSONResponse(status_code=200 if body["ready"] else 503, content=body)
+
+
+@app.get("/metrics")
+def get_metrics():
+    """Request, stage, cache and executor metrics in the Prometheus text format."""
+    caches = {
+        "parse": parse_cache_stats(),
+        "svg": svg_cache_stats(),
+        "embedding": embeddings.embedding_cache_stats(),
+    }
+    return PlainTextResponse(
+        metrics.render(caches=caches, executors=executor_stats()),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 @app.get("/")
 def read_root():
     return {"message": "Hello from the AMR Summarizer API!"}
@@ -39,11 +206,11 @@ def read_root():
 
 MAX_SUMMARY_LENGTH = 2000
 MAX_ARTICLE_LENGTH = 10000
+MAX_BATCH_SUMMARIES = 50
 
 
-@app.post("/process_article", response_model=Dict)
-def process_article(input_data: TextInput):
-    # Trim whitespace and validate inputs
+def _clean_input(input_data: TextInput, max_article_length: int = MAX_ARTICLE_LENGTH) -> tuple[str, str]:
+    """Trim whitespace and validate the summary and article of a request."""
     summary_clean = input_data.summary.strip()
     article_clean = input_data.article.strip()
 
@@ -53,7 +220,7 @@ def process_article(input_data: TextInput):
         raise HTTPException(status_code=400, detail="Article is required.")
     if len(summary_clean) > MAX_SUMMARY_LENGTH:
         raise HTTPException(status_code=400, detail="Summary is too long.")
-    if len(article_clean) > MAX_ARTICLE_LENGTH:
+    if len(article_clean) > max_article_length:
         raise HTTPException(status_code=400, detail="Article is too long.")
 
     # Simulate an error for testing purposes
@@ -64,81 +231,353 @@ def process_article(input_data: TextInput):
         raise HTTPException(
             status_code=500, detail="Simulated backend error for testing."
         )
+    return summary_clean, article_clean
 
-    sentences = segment_sentences(article_clean)
+
+@app.post("/process_article", response_model=Dict)
+async def process_article(input_data: TextInput):
+    summary_clean, article_clean = _clean_input(input_data)
+
+    sentences = await run_stage("segment", segment_sentences, article_clean)
     if not sentences:
         raise HTTPException(
             status_code=400, detail="No valid sentences found in the article."
         )
 
-    summary_embedding = get_embeddings([summary_clean])[0]
-    sentence_embeddings = get_embeddings(sentences)
-    top_sentences, scores = top_k_sentences(
-        summary_embedding, sentence_embeddings, sentences, k=3
-    )
+    # Encode the summary and the article sentences in one batched call
+    embeddings = await run_stage("embed", get_embeddings, [summary_clean] + sentences)
+    summary_embedding, sentence_embeddings = embeddings[0], embeddings[1:]
+    with stage_timer("retrieve"):
+        top_sentences, scores = top_k_sentences(
+            summary_embedding, sentence_embeddings, sentences, k=3
+        )
+    result = {"top_sentences": top_sentences, "similarity_scores": scores}
 
-    return {"top_sentences": top_sentences, "similarity_scores": scores}
+    index = _sentence_index
+    if index is None and SENTENCE_INDEX_PATH:
+        # Not warmed up yet: read the index off the event loop
+        index = await run_stage("retrieve", get_sentence_index)
+    if index is not None:
+        [(corpus_sentences, corpus_scores)] = await run_stage(
+            "retrieve", index.query, summary_embedding, k=3
+        )
+        result["corpus_sentences"] = corpus_sentences
+        result["corpus_scores"] = corpus_scores
 
+    return result
 
-@app.post("/process_amr", response_model=Dict)
-def process_amr(input_data: TextInput):
-    # Trim whitespace and validate inputs
-    summary_clean = input_data.summary.strip()
-    article_clean = input_data.article.strip()
 
-    if not summary_clean:
-        raise HTTPException(status_code=400, detail="Summary is required.")
-    if not article_clean:
-        raise HTTPException(status_code=400, detail="Article is required.")
-    if len(summary_clean) > MAX_SUMMARY_LENGTH:
-        raise HTTPException(status_code=400, detail="Summary is too long.")
-    if len(article_clean) > MAX_ARTICLE_LENGTH:
-        raise HTTPException(status_code=400, detail="Article is too long.")
+async def _render_svg(amr) -> tuple:
+    """Render one AMR on the render pool; returns (svg, None) or (None, error)."""
+    try:
+        return await run_stage("render", amr_to_svg, amr), None
+    except StageOverloaded:
+        raise
+    except Exception as e:
+        return None, f"Rendering failed: {e}"
 
-    if (
-        summary_clean.lower() == "simulate error"
-        or article_clean.lower() == "simulate error"
-    ):
-        raise HTTPException(
-            status_code=500, detail="Simulated backend error for testing."
-        )
 
-    sentences = segment_sentences(article_clean)
+async def _retrieve_top_sentences(summary_clean: str, article_clean: str, timings: dict = None):
+    """Segment the article and return its top-3 (sentences, scores) for the summary."""
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    sentences = await run_stage("segment", segment_sentences, article_clean)
+    timings["segment"] = time.perf_counter() - start
     if not sentences:
         raise HTTPException(
             status_code=400, detail="No valid sentences found in the article."
         )
 
-    summary_embedding = get_embeddings([summary_clean])[0]
-    sentence_embeddings = get_embeddings(sentences)
-    top_sentences, _ = top_k_sentences(
-        summary_embedding, sentence_embeddings, sentences, k=3
-    )
+    # Encode the summary and the article sentences in one batched call
+    start = time.perf_counter()
+    embeddings = await run_stage("embed", get_embeddings, [summary_clean] + sentences)
+    timings["embed"] = time.perf_counter() - start
+    summary_embedding, sentence_embeddings = embeddings[0], embeddings[1:]
+    start = time.perf_counter()
+    with stage_timer("retrieve"):
+        top = top_k_sentences(summary_embedding, sentence_embeddings, sentences, k=3)
+    timings["retrieve"] = time.perf_counter() - start
+    return top
+
+
+@app.post("/process_amr", response_model=Dict)
+async def process_amr(input_data: TextInput):
+    summary_clean, article_clean = _clean_input(input_data)
+    top_sentences, _ = await _retrieve_top_sentences(summary_clean, article_clean)
 
     try:
         # Parse AMR graphs and convert to SVG
-        summary_amr_raw = parse_amr(summary_clean)
-        top_sentence_amrs_raw = {
-            sentence: parse_amr(sentence) for sentence in top_sentences
-        }
-        summary_svg = amr_to_svg(summary_amr_raw)
-        top_sentence_svgs = {
-            sentence: amr_to_svg(amr) for sentence, amr in top_sentence_amrs_raw.items()
-        }
+        # Parse the summary and all top sentences in one batched call
+        amrs = await run_stage("parse", parse_amr_batch, [summary_clean] + top_sentences)
+        summary_amr_raw = amrs[0]
+        top_sentence_amrs_raw = dict(zip(top_sentences, amrs[1:]))
 
-        # Binary consistency check
         source_amrs = list(top_sentence_amrs_raw.values())
-        is_consistent, consistency_score = is_factually_consistent(
-            summary_amr_raw, source_amrs, threshold=0.8
-        )
+        if input_data.output == "graph":
+            # Node/edge JSON with overlap markers; no Graphviz involved
+            summary_triples = extract_triples(summary_amr_raw)
+            source_triples = set().union(*(extract_triples(amr) for amr in source_amrs))
+            graphs = {
+                "summary_graph": amr_to_graph_json(summary_amr_raw, source_triples),
+                "top_sentence_graphs": {
+                    sentence: amr_to_graph_json(amr, summary_triples)
+                    for sentence, amr in top_sentence_amrs_raw.items()
+                },
+            }
+        else:
+            # Render all graphs concurrently on the render pool; a graph that
+            # fails to render gets no SVG instead of failing the request
+            rendered = await asyncio.gather(
+                _render_svg(summary_amr_raw),
+                *(_render_svg(amr) for amr in source_amrs),
+            )
+            labels = ["summary"] + list(top_sentence_amrs_raw)
+            graphs = {
+                "summary_svg": rendered[0][0],
+                "top_sentence_svgs": {
+                    sentence: svg for sentence, (svg, _) in zip(top_sentence_amrs_raw, rendered[1:])
+                },
+                "render_errors": {
+                    label: error for label, (_, error) in zip(labels, rendered) if error is not None
+                },
+            }
+
+        # Binary consistency check
+        with stage_timer("consistency"):
+            is_consistent, consistency_score = is_factually_consistent(
+                summary_amr_raw, source_amrs, threshold=0.8
+            )
+    except StageOverloaded:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"AMR parsing or visualization failed: {str(e)}"
         )
 
     return {
-        "summary_svg": summary_svg,
-        "top_sentence_svgs": top_sentence_svgs,
+        **graphs,
         "consistency_score": round(consistency_score, 3),
         "is_consistent": is_consistent,
     }
+
+
+async def _timed(awaitable):
+    start = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - start
+
+
+def _ndjson(event: dict) -> bytes:
+    return (json.dumps(event) + "\n").encode("utf-8")
+
+
+async def _stream_amr_events(summary_clean, top_sentences, scores, output, timings):
+    """
+    Yield the NDJSON events of /process_amr/stream: top sentences first, then
+    each parsed AMR and rendered graph as soon as it is ready, then the result.
+    """
+    start = time.perf_counter()
+    yield _ndjson({
+        "event": "top_sentences",
+        "top_sentences": top_sentences,
+        "similarity_scores": scores,
+        "timings": timings,
+    })
+
+    labels = ["summary"] + top_sentences
+    amrs = [None] * len(labels)
+    # All texts go to the parser in one call, holding a single parse slot and
+    # sharing forward passes; each graph is reported through a queue as soon
+    # as it is ready, and rendered graphs report through the same queue
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    parse_start = time.perf_counter()
+
+    def on_parsed(i, amr):
+        seconds = time.perf_counter() - parse_start
+        loop.call_soon_threadsafe(events.put_nowait, ("parse", i, amr, seconds))
+
+    def on_done(task, kind, i=None):
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            events.put_nowait(("error", None, task.exception(), None))
+        elif kind == "render":
+            svg_error, seconds = task.result()
+            events.put_nowait(("render", i, svg_error, seconds))
+
+    tasks = [asyncio.ensure_future(run_stage(
+        "parse", parse_amr_batch, [summary_clean] + top_sentences, on_result=on_parsed
+    ))]
+    tasks[0].add_done_callback(lambda task: on_done(task, "parse"))
+    remaining = len(labels) * (2 if output == "svg" else 1)
+    render_start = None
+    try:
+        while remaining:
+            kind, i, result, seconds = await events.get()
+            if kind == "error":
+                raise result
+            remaining -= 1
+            if kind == "parse":
+                amrs[i] = result
+                timings["parse"] = time.perf_counter() - parse_start
+                yield _ndjson({
+                    "event": "amr", "index": i, "label": labels[i],
+                    "amr": str(amrs[i]), "seconds": seconds,
+                })
+                if output == "svg":
+                    render_start = render_start or time.perf_counter()
+                    render = asyncio.ensure_future(_timed(_render_svg(amrs[i])))
+                    render.add_done_callback(lambda task, i=i: on_done(task, "render", i))
+                    tasks.append(render)
+            else:
+                svg, error = result
+                timings["render"] = time.perf_counter() - render_start
+                yield _ndjson({
+                    "event": "svg", "index": i, "label": labels[i],
+                    "svg": svg, "error": error, "seconds": seconds,
+                })
+
+        check_start = time.perf_counter()
+        if output == "graph":
+            summary_triples = extract_triples(amrs[0])
+            source_triples = set().union(*(extract_triples(amr) for amr in amrs[1:]))
+            for i, amr in enumerate(amrs):
+                matched = source_triples if i == 0 else summary_triples
+                yield _ndjson({
+                    "event": "graph", "index": i, "label": labels[i],
+                    "graph": amr_to_graph_json(amr, matched),
+                })
+        with stage_timer("consistency"):
+            is_consistent, consistency_score = is_factually_consistent(
+                amrs[0], amrs[1:], threshold=0.8
+            )
+        timings["consistency"] = time.perf_counter() - check_start
+        timings["total"] = timings["segment"] + timings["embed"] + timings["retrieve"] + (
+            time.perf_counter() - start
+        )
+        yield _ndjson({
+            "event": "result",
+            "consistency_score": round(consistency_score, 3),
+            "is_consistent": is_consistent,
+            "timings": timings,
+        })
+    except StageOverloaded as e:
+        yield _ndjson({"event": "error", "detail": str(e), "retry_after": e.retry_after})
+    except Exception as e:
+        yield _ndjson({"event": "error", "detail": f"AMR parsing or visualization failed: {e}"})
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+@app.post("/process_amr/stream")
+async def process_amr_stream(input_data: TextInput):
+    """
+    Streaming variant of /process_amr returning NDJSON events:
+    "top_sentences", one "amr" per parsed graph, one "svg" per rendered graph
+    (or one "graph" per graph with output "graph"), then "result" with the
+    consistency check and per-stage timings in seconds. Failures after the
+    stream has started arrive as an "error" event.
+    """
+    summary_clean, article_clean = _clean_input(input_data)
+    timings = {}
+    top_sentences, scores = await _retrieve_top_sentences(summary_clean, article_clean, timings)
+    return StreamingResponse(
+        _stream_amr_events(summary_clean, top_sentences, scores, input_data.output, timings),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/jobs", status_code=202)
+def create_job(input_data: TextInput):
+    """
+    Queue a full consistency check (see consistency.check_consistency) to run
+    in the background. Identical summary/article pairs share one job.
+    """
+    summary_clean, article_clean = _clean_input(input_data, MAX_JOB_ARTICLE_LENGTH)
+    return get_job_runner().submit({"summary": summary_clean, "article": article_clean})
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = get_job_runner().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+@app.post("/process_amr_batch", response_model=Dict)
+async def process_amr_batch(input_data: BatchInput):
+    """
+    Check many candidate summaries against one article.
+
+    The article is segmented and embedded once, top sentences for every
+    summary come from one matrix product, and the union of all summaries
+    and retrieved sentences is parsed in one batch. "reuse" reports how
+    much work was shared.
+    """
+    if not input_data.summaries:
+        raise HTTPException(status_code=400, detail="At least one summary is required.")
+    if len(input_data.summaries) > MAX_BATCH_SUMMARIES:
+        raise HTTPException(status_code=400, detail="Too many summaries.")
+    cleaned = [
+        _clean_input(TextInput(summary=summary, article=input_data.article))
+        for summary in input_data.summaries
+    ]
+    summaries = [summary for summary, _ in cleaned]
+    article_clean = cleaned[0][1]
+
+    sentences = await run_stage("segment", segment_sentences, article_clean)
+    if not sentences:
+        raise HTTPException(
+            status_code=400, detail="No valid sentences found in the article."
+        )
+
+    # Encode all summaries and the article sentences in one batched call
+    embeddings = await run_stage("embed", get_embeddings, summaries + sentences)
+    with stage_timer("retrieve"):
+        retrieved = top_k_sentences_batch(
+            embeddings[:len(summaries)], embeddings[len(summaries):], sentences, k=3
+        )
+
+    # Parse every distinct summary and retrieved sentence exactly once
+    needed = list(dict.fromkeys(
+        summaries + [sentence for top_sentences, _ in retrieved for sentence in top_sentences]
+    ))
+    try:
+        amrs = dict(zip(needed, await run_stage("parse", parse_amr_batch, needed)))
+        results = []
+        for summary, (top_sentences, scores) in zip(summaries, retrieved):
+            with stage_timer("consistency"):
+                is_consistent, consistency_score = is_factually_consistent(
+                    amrs[summary], [amrs[sentence] for sentence in top_sentences], threshold=0.8
+                )
+            results.append({
+                "summary": summary,
+                "top_sentences": top_sentences,
+                "similarity_scores": scores,
+                "consistency_score": round(consistency_score, 3),
+                "is_consistent": is_consistent,
+            })
+    except StageOverloaded:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"AMR parsing failed: {str(e)}"
+        )
+
+    retrieved_count = sum(len(top_sentences) for top_sentences, _ in retrieved)
+    return {
+        "results": results,
+        "reuse": {
+            "summaries": len(summaries),
+            "article_sentences": len(sentences),
+            "article_segmentations": 1,
+            "embedded_texts": len(summaries) + len(sentences),
+            "retrieved_sentences": retrieved_count,
+            "parsed_texts": len(needed),
+            # Parses a /process_amr call per summary would have needed
+            "parses_saved": len(summaries) + retrieved_count - len(needed),
+        },
+    }
@@ -1,24 +1,53 @@
-from penman import decode
+import os
 
+import numpy as np
 
-def extract_triples(amr_str: str) -> set[tuple]:
+from .amr_graph import decode_amr
+
+# How triples are compared: "raw" uses the variables as written, "concept"
+# replaces every variable by its concept so that graphs differing only in
+# variable names overlap (a cheap stand-in for a full alignment)
+TRIPLE_MODES = ("raw", "concept")
+DEFAULT_TRIPLE_MODE = os.environ.get("AMR_TRIPLE_MODE", "raw")
+
+
+def list_triples(amr_str, mode: str = None) -> list[tuple]:
+    """
+    The (source, role, target) triples of an AMR as compared by the metrics,
+    in graph order (position i corresponds to the graph's i-th triple).
+
+    With mode="concept" variables are replaced by their concepts
+    (defaults to AMR_TRIPLE_MODE, else "raw").
     """
-    Parse an AMR in Penman format into a penman.Graph and
-    return the set of (source, role, target) triples.
+    mode = mode or DEFAULT_TRIPLE_MODE
+    graph = decode_amr(amr_str)
+    if mode == "raw":
+        return graph.triples
+    if mode == "concept":
+        return graph.concept_triples()
+    raise ValueError(f"Unknown triple mode {mode!r}; expected one of {TRIPLE_MODES}")
+
+
+def extract_triples(amr_str, mode: str = None) -> set[tuple]:
+    """
+    Decode an AMR in Penman format (or take an already decoded ParsedAMR)
+    and return the set of (source, role, target) triples.
+
+    With mode="concept" variables are replaced by their concepts
+    (defaults to AMR_TRIPLE_MODE, else "raw").
     """
-    graph = decode(amr_str)
-    return set(graph.triples)
+    return set(list_triples(amr_str, mode))
 
 
-def smatch_f1(amr1: str, amr2: str) -> float:
+def smatch_f1(amr1, amr2, mode: str = None) -> float:
     """
     Compute a simple Smatch‐style F1 between two AMR strings.
     Precision = |T2 ∩ T1| / |T2|
     Recall    = |T1 ∩ T2| / |T1|
     F1        = 2PR/(P+R)
     """
-    t1 = extract_triples(amr1)
-    t2 = extract_triples(amr2)
+    t1 = extract_triples(amr1, mode)
+    t2 = extract_triples(amr2, mode)
 
     # Edge cases
     if not t1 and not t2:
@@ -35,17 +64,17 @@ def smatch_f1(amr1: str, amr2: str) -> float:
 
 
 def is_factually_consistent(
-    summary_amr: str, source_amrs: list[str], threshold: float = 0.8
+    summary_amr, source_amrs: list, threshold: float = 0.8, mode: str = None
 ) -> tuple[bool, float]:
     """
     Binary consistency check: what fraction of summary triples
     appear in the union of all source_amrs?  Return (ok, score).
     """
-    summary_triples = extract_triples(summary_amr)
+    summary_triples = extract_triples(summary_amr, mode)
 
     merged = set()
     for amr in source_amrs:
-        merged |= extract_triples(amr)
+        merged |= extract_triples(amr, mode)
 
     if not summary_triples:
         score = 1.0
@@ -54,3 +83,88 @@ def is_factually_consistent(
         score = len(common) / len(summary_triples)
 
     return (score >= threshold, score)
+
+
+def _triple_incidence(amrs, vocab: dict, mode: str = None) -> tuple[list, list]:
+    """
+    Encode each AMR's distinct triples as column indices into a shared
+    triple vocabulary, in CSR (indptr, indices) form.
+    """
+    indptr, indices = [0], []
+    for amr in amrs:
+        columns = {vocab.setdefault(t, len(vocab)) for t in list_triples(amr, mode)}
+        indices.extend(columns)
+        indptr.append(len(indices))
+    return indptr, indices
+
+
+def triple_overlap_matrix(
+    amrs1: list, amrs2: list, mode: str = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count shared triples between every pair of AMRs from two lists.
+
+    Each AMR is decoded and encoded once as a sparse row of triple ids; all
+    N x M intersection sizes then come from a single sparse product.
+
+    Parameters:
+        amrs1 (List[str | ParsedAMR]): N AMRs.
+        amrs2 (List[str | ParsedAMR]): M AMRs.
+        mode (str): Triple mode, one of TRIPLE_MODES.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: The (N, M) intersection
+        counts, and the triple counts of amrs1 (N,) and amrs2 (M,).
+    """
+    from scipy import sparse
+
+    vocab = {}
+    rows1 = _triple_incidence(amrs1, vocab, mode)
+    rows2 = _triple_incidence(amrs2, vocab, mode)
+    shape = len(vocab)
+
+    def to_csr(rows, n):
+        indptr, indices = rows
+        data = np.ones(len(indices), dtype=np.int32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(n, shape))
+
+    m1 = to_csr(rows1, len(amrs1))
+    m2 = to_csr(rows2, len(amrs2))
+    inter = (m1 @ m2.T).toarray()
+    return inter, np.diff(rows1[0]), np.diff(rows2[0])
+
+
+def smatch_f1_matrix(amrs1: list, amrs2: list, mode: str = None) -> np.ndarray:
+    """
+    Compute smatch_f1 for every pair in amrs1 x amrs2.
+
+    Returns:
+        np.ndarray: (N, M) float64 matrix; entry [i, j] equals
+        smatch_f1(amrs1[i], amrs2[j], mode).
+    """
+    inter, n1, n2 = triple_overlap_matrix(amrs1, amrs2, mode)
+    n1 = n1[:, None]
+    n2 = n2[None, :]
+    # Same operations, in the same order, as the scalar version
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = inter / n2
+        r = inter / n1
+        f1 = 2 * p * r / (p + r)
+    f1 = np.where(inter > 0, f1, 0.0)
+    f1[(n1 == 0) & (n2 == 0)] = 1.0
+    return f1
+
+
+def coverage_matrix(summary_amrs: list, source_amrs: list, mode: str = None) -> np.ndarray:
+    """
+    Fraction of each summary's triples found in each single source AMR.
+
+    Returns:
+        np.ndarray: (N, M) float64 matrix; entry [i, j] equals the score of
+        is_factually_consistent(summary_amrs[i], [source_amrs[j]], mode=mode).
+    """
+    inter, n1, _ = triple_overlap_matrix(summary_amrs, source_amrs, mode)
+    n1 = n1[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coverage = inter / n1
+    return np.where(n1 == 0, 1.0, coverage)
@@ -1,6 +1,16 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
 
 class TextInput(BaseModel):
     summary: str
     article: str
+    # How /process_amr returns graphs: rendered SVG documents, or node/edge
+    # JSON for client-side drawing
+    output: Literal["svg", "graph"] = "svg"
+
+
+class BatchInput(BaseModel):
+    summaries: list[str]
+    article: str
@@ -1,19 +1,129 @@
-import spacy
+import os
+import re
+import threading
 
-# Load the English model (ensure you have run: python -m spacy download en_core_web_sm)
-nlp = spacy.load("en_core_web_sm")
+# Sentence segmentation backends:
+#   spacy       - en_core_web_sm dependency parse, unused components disabled
+#   senter      - en_core_web_sm statistical sentence recognizer, no parser
+#   sentencizer - spaCy's rule-based punctuation sentencizer (no model needed)
+#   regex       - pure-Python punctuation splitter
+SEGMENTERS = ("spacy", "senter", "sentencizer", "regex")
+DEFAULT_SEGMENTER = os.environ.get("AMR_SEGMENTER", "spacy")
 
+# en_core_web_sm components that sentence splitting never uses
+_UNUSED_COMPONENTS = ["tagger", "attribute_ruler", "lemmatizer", "ner"]
 
-def segment_sentences(text: str):
+_pipelines = {}
+_nlp_lock = threading.Lock()
+
+
+def _load_pipeline(mode: str):
+    import spacy
+
+    if mode == "spacy":
+        # Make sure you have run: python -m spacy download en_core_web_sm
+        return spacy.load("en_core_web_sm", disable=_UNUSED_COMPONENTS)
+    if mode == "senter":
+        nlp = spacy.load("en_core_web_sm", exclude=_UNUSED_COMPONENTS + ["parser"])
+        nlp.enable_pipe("senter")
+        return nlp
+    if mode == "sentencizer":
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        return nlp
+    raise ValueError(f"Unknown spaCy segmenter {mode!r}; expected one of {SEGMENTERS}")
+
+
+def get_nlp(mode: str = None):
+    """
+    Return the spaCy pipeline for a segmentation mode, loading it on first use.
+
+    Parameters:
+        mode (str): One of "spacy", "senter" or "sentencizer"
+            (defaults to AMR_SEGMENTER, else "spacy").
+    """
+    mode = mode or DEFAULT_SEGMENTER
+    nlp = _pipelines.get(mode)
+    if nlp is None:
+        with _nlp_lock:
+            nlp = _pipelines.get(mode)
+            if nlp is None:
+                nlp = _load_pipeline(mode)
+                _pipelines[mode] = nlp
+    return nlp
+
+
+def load(mode: str = None):
+    """Load the pipeline of the given (or default) mode ahead of the first request."""
+    if (mode or DEFAULT_SEGMENTER) != "regex":
+        get_nlp(mode)
+
+
+def is_loaded(mode: str = None) -> bool:
+    mode = mode or DEFAULT_SEGMENTER
+    return mode == "regex" or mode in _pipelines
+
+
+# Sentence end: terminal punctuation, optional closing quotes/brackets, whitespace,
+# then something that can start a sentence
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])")
+_ABBREVIATIONS = {
+    "mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "st.", "vs.",
+    "e.g.", "i.e.", "etc.", "inc.", "ltd.", "co.", "corp.", "no.", "u.s.",
+}
+
+
+def _regex_split(text: str) -> list[str]:
+    sentences, start = [], 0
+    for match in _SENTENCE_END.finditer(text):
+        candidate = text[start:match.end()].strip()
+        last_word = candidate.rsplit(None, 1)[-1].lower() if candidate else ""
+        if last_word in _ABBREVIATIONS:
+            continue
+        sentences.append(candidate)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def segment_sentences(text: str, mode: str = None):
     """
-    Splits the input text into sentences using spaCy.
+    Splits the input text into sentences.
 
     Parameters:
         text (str): The text to segment.
+        mode (str): Segmentation backend, one of SEGMENTERS
+            (defaults to AMR_SEGMENTER, else "spacy").
 
     Returns:
         List[str]: A list of sentence strings.
     """
-    doc = nlp(text)
+    mode = mode or DEFAULT_SEGMENTER
+    if mode == "regex":
+        return _regex_split(text)
+    doc = get_nlp(mode)(text)
     sentences = [sent.text.strip() for sent in doc.sents]
     return sentences
+
+
+def segment_many(texts, mode: str = None, batch_size: int = 64):
+    """
+    Split many documents into sentences, streaming them through nlp.pipe.
+
+    Parameters:
+        texts (Iterable[str]): The documents to segment.
+        mode (str): Segmentation backend, one of SEGMENTERS.
+        batch_size (int): Documents per spaCy batch.
+
+    Returns:
+        List[List[str]]: The sentences of each document, in input order.
+    """
+    mode = mode or DEFAULT_SEGMENTER
+    if mode == "regex":
+        return [_regex_split(text) for text in texts]
+    return [
+        [sent.text.strip() for sent in doc.sents]
+        for doc in get_nlp(mode).pipe(texts, batch_size=batch_size)
+    ]
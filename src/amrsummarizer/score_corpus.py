@@ -0,0 +1,138 @@
+"""
+Score a whole corpus of (summary, article) pairs offline.
+
+Usage (from project root, with PYTHONPATH=./src):
+    python -m amrsummarizer.score_corpus --input pairs.jsonl --output scores.jsonl --workers 2
+
+Input is JSONL with "summary" and "article" fields (and an optional "id"),
+or TSV with summary and article columns (an optional first "id" column is
+used when a row has three fields). Results are appended to the output
+JSONL as they finish; rerunning the same command resumes after the pairs
+already present in the output.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+from multiprocessing import Pool
+
+from .consistency import check_consistency_many
+
+
+def read_pairs(path: str, fmt: str = None):
+    """Stream (id, summary, article) records from a JSONL or TSV file."""
+    fmt = fmt or ("tsv" if path.endswith((".tsv", ".tab")) else "jsonl")
+    with open(path, encoding="utf-8", newline="") as f:
+        if fmt == "jsonl":
+            for line_no, line in enumerate(f):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                yield str(record.get("id", line_no)), record["summary"], record["article"]
+        else:
+            reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+            for line_no, row in enumerate(reader):
+                if len(row) == 3:
+                    yield row[0], row[1], row[2]
+                elif len(row) == 2:
+                    yield str(line_no), row[0], row[1]
+
+
+def load_checkpoint(path: str) -> set:
+    """
+    Return the ids already scored in an existing output file.
+
+    A line cut short by a crash is dropped from the file so that new results
+    are appended after the last complete record.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    valid_bytes = 0
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                done.add(str(json.loads(line)["id"]))
+            except (ValueError, KeyError):
+                break
+            valid_bytes += len(line)
+    with open(path, "r+b") as f:
+        f.truncate(valid_bytes)
+    return done
+
+
+def chunked(records, size: int):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+_options = {}
+
+
+def _init_worker(k: int, threshold: float):
+    _options.update(k=k, threshold=threshold)
+
+
+def _score_chunk(chunk):
+    pairs = [(summary, article) for _, summary, article in chunk]
+    try:
+        results = check_consistency_many(pairs, **_options)
+    except Exception as e:
+        results = [{"error": f"Scoring failed: {e}"} for _ in chunk]
+    return [dict(id=record_id, **result) for (record_id, _, _), result in zip(chunk, results)]
+
+
+def main():
+    p = argparse.ArgumentParser(description="Batch-score summary/article pairs for factual consistency")
+    p.add_argument("--input", required=True, help="JSONL or TSV file of pairs")
+    p.add_argument("--output", required=True, help="JSONL results (appended to when resuming)")
+    p.add_argument("--format", choices=["jsonl", "tsv"], default=None, help="Input format (default: by extension)")
+    p.add_argument("--workers", type=int, default=1, help="Worker processes (each loads its own models)")
+    p.add_argument("--chunk-size", type=int, default=16, help="Pairs scored together in one batch")
+    p.add_argument("--k", type=int, default=3, help="Article sentences retrieved per summary")
+    p.add_argument("--threshold", type=float, default=0.8, help="Consistency threshold")
+    args = p.parse_args()
+
+    done = load_checkpoint(args.output)
+    if done:
+        print(f"Resuming: {len(done)} pairs already scored", file=sys.stderr)
+    pending = (r for r in read_pairs(args.input, args.format) if r[0] not in done)
+    chunks = chunked(pending, args.chunk_size)
+
+    scored, failed = 0, 0
+    start = time.perf_counter()
+    with open(args.output, "a", encoding="utf-8") as out, \
+            Pool(args.workers, initializer=_init_worker, initargs=(args.k, args.threshold)) as pool:
+        # Hand out a few chunks per worker at a time so the input is streamed
+        # rather than read into the pool's task queue all at once
+        while True:
+            window = list(islice(chunks, args.workers * 4))
+            if not window:
+                break
+            for results in pool.imap_unordered(_score_chunk, window):
+                for result in results:
+                    out.write(json.dumps(result) + "\n")
+                    failed += "error" in result
+                out.flush()
+                scored += len(results)
+                elapsed = time.perf_counter() - start
+                print(f"\r{scored} pairs scored ({failed} failed), {scored / elapsed:.2f} pairs/s",
+                      end="", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    rate = scored / elapsed if elapsed > 0 else 0.0
+    print(f"\nDone: {scored} pairs in {elapsed:.1f} s ({rate:.2f} pairs/s), "
+          f"results in {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+import argparse
+import json
+import os
+
+import numpy as np
+from numpy.linalg import norm
+
+META_FILE = "meta.json"
+VECTORS_FILE = "vectors.bin"
+SENTENCES_FILE = "sentences.jsonl"
+CENTROIDS_FILE = "centroids.npy"
+ASSIGNMENTS_FILE = "assignments.npy"
+
+# Rows scored per matrix product when scanning a segment, to bound memory use
+SCAN_CHUNK_ROWS = 65536
+
+
+def _normalize(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class SentenceIndex:
+    """
+    Persistent cosine-similarity index over sentence embeddings.
+
+    Vectors are stored unit-normalized as float32 or float16 in one flat
+    binary file that is memory-mapped on load; sentences added after loading
+    are kept in memory until the next save(), which appends them to the file.
+
+    Two search backends are available:
+        exact - brute-force scan of every vector
+        ivf   - inverted file: vectors are bucketed by their nearest k-means
+                centroid and a query only scans its nprobe closest buckets.
+                Falls back to exact search until train() has been called.
+    """
+
+    def __init__(self, dim: int, dtype: str = "float32", backend: str = "exact", nprobe: int = 8):
+        if backend not in ("exact", "ivf"):
+            raise ValueError(f"Unknown backend {backend!r}; expected 'exact' or 'ivf'")
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.backend = backend
+        self.nprobe = nprobe
+        self.path = None
+        self.sentences = []
+        self.doc_ids = []
+        self._stored = None  # memory-mapped vectors already on disk
+        self._pending = []  # arrays added since the last save
+        self.centroids = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self._lists = None
+
+    def __len__(self):
+        return len(self.sentences)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def _segments(self):
+        """Yield (offset, vectors) for the stored and pending vector blocks."""
+        offset = 0
+        if self._stored is not None:
+            yield offset, self._stored
+            offset += len(self._stored)
+        for block in self._pending:
+            yield offset, block
+            offset += len(block)
+
+    def _gather(self, rows) -> np.ndarray:
+        """Fetch the given (sorted) row ids as float32, reading only those rows."""
+        stored = len(self._stored) if self._stored is not None else 0
+        vectors = np.empty((len(rows), self.dim), dtype=np.float32)
+        on_disk = rows < stored
+        if on_disk.any():
+            vectors[on_disk] = self._stored[rows[on_disk]]
+        if not on_disk.all():
+            if len(self._pending) > 1:
+                self._pending = [np.concatenate(self._pending)]
+            vectors[~on_disk] = self._pending[0][rows[~on_disk] - stored]
+        return vectors
+
+    def add(self, sentences, embeddings=None, doc_ids=None):
+        """
+        Add sentences to the index.
+
+        Parameters:
+            sentences (List[str]): Sentences to add.
+            embeddings (numpy.ndarray): Their embeddings; computed with
+                embeddings.get_embeddings when omitted.
+            doc_ids (List[str]): Optional source document id per sentence.
+        """
+        sentences = list(sentences)
+        if not sentences:
+            return
+        if embeddings is None:
+            from .embeddings import get_embeddings
+
+            embeddings = get_embeddings(sentences)
+        vectors = _normalize(embeddings)
+        if vectors.shape != (len(sentences), self.dim):
+            raise ValueError(
+                f"Expected embeddings of shape ({len(sentences)}, {self.dim}), got {vectors.shape}"
+            )
+        self._pending.append(vectors.astype(self.dtype))
+        self.sentences.extend(sentences)
+        self.doc_ids.extend(doc_ids if doc_ids is not None else [None] * len(sentences))
+        if self.is_trained:
+            self.assignments = np.concatenate([self.assignments, self._assign(vectors)])
+            self._lists = None
+
+    def train(self, nlist: int = None, iterations: int = 10, sample_size: int = 100000, seed: int = 0):
+        """
+        Fit the IVF coarse quantizer with spherical k-means and bucket all vectors.
+
+        Parameters:
+            nlist (int): Number of buckets (defaults to about sqrt(len(index))).
+            iterations (int): k-means iterations.
+            sample_size (int): Vectors sampled to fit the centroids.
+        """
+        count = len(self)
+        if count == 0:
+            raise ValueError("Cannot train an empty index")
+        nlist = min(nlist or max(1, int(np.sqrt(count))), count)
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(count, size=min(sample_size, count), replace=False))
+        sample = self._gather(sample_rows)
+
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids = _normalize(centroids)
+
+        self.centroids = centroids
+        self.backend = "ivf"
+        self.assignments = np.concatenate(
+            [self._assign(block) for _, block in self._segments()]
+        )
+        self._lists = None
+
+    def _assign(self, vectors) -> np.ndarray:
+        assignments = []
+        for start in range(0, len(vectors), SCAN_CHUNK_ROWS):
+            chunk = np.asarray(vectors[start:start + SCAN_CHUNK_ROWS], dtype=np.float32)
+            assignments.append(np.argmax(chunk @ self.centroids.T, axis=1))
+        if not assignments:
+            return np.zeros(0, dtype=np.int32)
+        return np.concatenate(assignments).astype(np.int32)
+
+    def _inverted_lists(self):
+        """Row ids grouped by bucket, plus the start offset of every bucket."""
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind="stable")
+            counts = np.bincount(self.assignments, minlength=len(self.centroids))
+            starts = np.concatenate([[0], np.cumsum(counts)])
+            self._lists = (order, starts)
+        return self._lists
+
+    def query(self, query_embeddings, k: int = 5, nprobe: int = None):
+        """
+        Find the k most similar indexed sentences for each query embedding.
+
+        Parameters:
+            query_embeddings (numpy.ndarray): (Q, D) or (D,) query vectors.
+            k (int): Results per query.
+            nprobe (int): IVF buckets scanned per query (defaults to self.nprobe).
+
+        Returns:
+            List[Tuple[List[str], List[float]]]: (sentences, cosine scores) per query,
+            best first.
+        """
+        queries = _normalize(np.atleast_2d(query_embeddings))
+        if self.backend == "ivf" and self.is_trained:
+            rows, scores = self._search_ivf(queries, k, nprobe or self.nprobe)
+        else:
+            rows, scores = self._search_exact(queries, k)
+        return [
+            ([self.sentences[i] for i in r], [float(s) for s in sc])
+            for r, sc in zip(rows, scores)
+        ]
+
+    def _search_exact(self, queries, k):
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+        for offset, block in self._segments():
+            for start in range(0, len(block), SCAN_CHUNK_ROWS):
+                chunk = np.asarray(block[start:start + SCAN_CHUNK_ROWS], dtype=np.float32)
+                scores = queries @ chunk.T
+                rows = np.broadcast_to(
+                    np.arange(offset + start, offset + start + len(chunk)), scores.shape
+                )
+                best_rows, best_scores = _merge_top_k(
+                    np.hstack([best_rows, rows]), np.hstack([best_scores, scores]), k
+                )
+        return best_rows, best_scores
+
+    def _search_ivf(self, queries, k, nprobe):
+        order, starts = self._inverted_lists()
+        probes = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+        all_rows, all_scores = [], []
+        for query, buckets in zip(queries, probes):
+            rows = np.sort(np.concatenate([order[starts[b]:starts[b + 1]] for b in buckets]))
+            scores = self._gather(rows) @ query
+            best_rows, best_scores = _merge_top_k(rows[np.newaxis], scores[np.newaxis], k)
+            all_rows.append(best_rows[0])
+            all_scores.append(best_scores[0])
+        return all_rows, all_scores
+
+    def save(self, path: str = None):
+        """
+        Write the index to a directory. Saving back to the directory the index
+        was loaded from only appends the sentences added since.
+        """
+        path = path or self.path
+        os.makedirs(path, exist_ok=True)
+        vectors_path = os.path.join(path, VECTORS_FILE)
+        sentences_path = os.path.join(path, SENTENCES_FILE)
+
+        if path == self.path:
+            blocks, new_sentences = self._pending, self._pending_sentences()
+            mode = "ab"
+        else:
+            blocks = [block for _, block in self._segments()]
+            new_sentences = list(zip(self.sentences, self.doc_ids))
+            mode = "wb"
+        with open(vectors_path, mode) as f:
+            for block in blocks:
+                f.write(np.ascontiguousarray(block, dtype=self.dtype).tobytes())
+        with open(sentences_path, mode[0], encoding="utf-8") as f:
+            for sentence, doc_id in new_sentences:
+                f.write(json.dumps({"text": sentence, "doc": doc_id}) + "\n")
+
+        if self.is_trained:
+            np.save(os.path.join(path, CENTROIDS_FILE), self.centroids)
+            np.save(os.path.join(path, ASSIGNMENTS_FILE), self.assignments)
+        meta = {
+            "dim": self.dim,
+            "dtype": self.dtype.name,
+            "count": len(self),
+            "backend": self.backend,
+            "nprobe": self.nprobe,
+        }
+        with open(os.path.join(path, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        self.path = path
+        self._stored = self._open_vectors(path, len(self))
+        self._pending = []
+
+    def _pending_sentences(self):
+        stored = len(self._stored) if self._stored is not None else 0
+        return list(zip(self.sentences[stored:], self.doc_ids[stored:]))
+
+    def _open_vectors(self, path, count):
+        if count == 0:
+            return None
+        return np.memmap(
+            os.path.join(path, VECTORS_FILE), dtype=self.dtype, mode="r", shape=(count, self.dim)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "SentenceIndex":
+        """Open a saved index; its vectors are memory-mapped, not read into RAM."""
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(meta["dim"], meta["dtype"], meta["backend"], meta.get("nprobe", 8))
+        with open(os.path.join(path, SENTENCES_FILE), encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                index.sentences.append(record["text"])
+                index.doc_ids.append(record.get("doc"))
+        index.path = path
+        index._stored = index._open_vectors(path, meta["count"])
+
+        centroids_path = os.path.join(path, CENTROIDS_FILE)
+        if os.path.exists(centroids_path):
+            index.centroids = np.load(centroids_path)
+            index.assignments = np.load(os.path.join(path, ASSIGNMENTS_FILE))
+        return index
+
+
+def _merge_top_k(rows, scores, k):
+    """Keep the k best (row, score) columns per query row, best first."""
+    if scores.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        rows = np.take_along_axis(rows, keep, axis=1)
+        scores = np.take_along_axis(scores, keep, axis=1)
+    order = np.argsort(-scores, axis=1, kind="stable")
+    return np.take_along_axis(rows, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def _add_batch(index, batch, get_embeddings, args):
+    embeddings = get_embeddings(batch)
+    if index is None:
+        index = SentenceIndex(embeddings.shape[1], args.dtype, args.backend)
+    index.add(batch, embeddings)
+    return index
+
+
+def main():
+    p = argparse.ArgumentParser(description="Build or extend a sentence index")
+    p.add_argument("--input", required=True, help="Text file with one sentence per line")
+    p.add_argument("--index", required=True, help="Index directory (extended if it exists)")
+    p.add_argument("--dtype", default="float32", choices=["float32", "float16"])
+    p.add_argument("--backend", default="exact", choices=["exact", "ivf"])
+    p.add_argument("--nlist", type=int, default=None, help="IVF buckets (default ~sqrt(N))")
+    p.add_argument("--batch-size", type=int, default=1024, help="Sentences embedded per call")
+    args = p.parse_args()
+
+    from .embeddings import get_embeddings
+
+    if os.path.exists(os.path.join(args.index, META_FILE)):
+        index = SentenceIndex.load(args.index)
+    else:
+        index = None
+
+    batch = []
+    with open(args.input, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                batch.append(line.strip())
+            if len(batch) == args.batch_size:
+                index = _add_batch(index, batch, get_embeddings, args)
+                batch = []
+    if batch:
+        index = _add_batch(index, batch, get_embeddings, args)
+    if index is None:
+        print("No sentences found in the input.")
+        return
+
+    if args.backend == "ivf":
+        index.train(nlist=args.nlist)
+    index.save(args.index)
+    print(f"Indexed {len(index)} sentences in {args.index} ({index.backend}, {index.dtype.name})")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,32 @@ def cosine_similarity(vector1, vector2):
     return np.dot(vector1, vector2) / (norm(vector1) * norm(vector2))
 
 
+def _normalize_rows(matrix):
+    """Scale each row to unit length (zero rows become NaN, like cosine_similarity)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return matrix / norm(matrix, axis=-1, keepdims=True)
+
+
+def _top_k_indices(scores, k):
+    """
+    Indices of the k highest scores, best first, without a full sort.
+
+    Ties and NaNs are ordered exactly like np.argsort(scores)[-k:][::-1]:
+    NaN ranks above every number and, among equal scores, the later index wins.
+    """
+    n = scores.shape[0]
+    keys = np.where(np.isnan(scores), np.inf, scores)
+    if k >= n:
+        order = np.argsort(keys, kind="stable")
+    else:
+        kth = np.partition(keys, n - k)[n - k]
+        above = np.flatnonzero(keys > kth)
+        ties = np.flatnonzero(keys == kth)[len(above) - k:]
+        candidates = np.concatenate([above, ties])
+        order = candidates[np.lexsort((candidates, keys[candidates]))]
+    return order[::-1]
+
+
 def top_k_sentences(summary_embedding, sentence_embeddings, sentences, k=3):
     """
     Select the top k sentences most similar to the summary.
@@ -29,13 +55,38 @@ def top_k_sentences(summary_embedding, sentence_embeddings, sentences, k=3):
         Tuple[List[str], List[float]]: A tuple containing the list of top k sentences
         and their corresponding similarity scores as native floats.
     """
-    similarities = [
-        cosine_similarity(summary_embedding, sent_emb)
-        for sent_emb in sentence_embeddings
-    ]
-    # Get the indices of the top k scores
-    top_indices = np.argsort(similarities)[-k:][::-1]
-    top_sentences = [sentences[i] for i in top_indices]
-    # Convert the similarity scores to native Python floats
-    top_scores = [float(similarities[i]) for i in top_indices]
-    return top_sentences, top_scores
+    summary_embedding = np.asarray(summary_embedding)
+    return top_k_sentences_batch(
+        summary_embedding[np.newaxis, :], sentence_embeddings, sentences, k=k
+    )[0]
+
+
+def top_k_sentences_batch(summary_embeddings, sentence_embeddings, sentences, k=3):
+    """
+    Select the top k sentences for several summaries against one article.
+
+    Embeddings are normalized once and all cosine similarities come from a
+    single matrix product; the top k per summary are picked with a partial
+    partition instead of a full sort.
+
+    Parameters:
+        summary_embeddings (numpy.ndarray): (S, D) embeddings, one row per summary.
+        sentence_embeddings (numpy.ndarray): (N, D) embeddings of the article sentences.
+        sentences (List[str]): Original sentences.
+        k (int): Number of top sentences to return per summary.
+
+    Returns:
+        List[Tuple[List[str], List[float]]]: (top sentences, scores) for each summary.
+    """
+    summaries = _normalize_rows(np.asarray(summary_embeddings))
+    article = _normalize_rows(np.asarray(sentence_embeddings))
+    similarities = summaries @ article.T
+
+    results = []
+    for row in similarities:
+        top_indices = _top_k_indices(row, k)
+        top_sentences = [sentences[i] for i in top_indices]
+        # Convert the similarity scores to native Python floats
+        top_scores = [float(row[i]) for i in top_indices]
+        results.append((top_sentences, top_scores))
+    return results
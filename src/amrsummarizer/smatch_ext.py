@@ -1,15 +1,92 @@
 import json
 import argparse
-from penman import decode
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+from itertools import islice, zip_longest
+from multiprocessing import Pool
+
+import penman
 from smatchpp import Smatchpp, solvers, interfaces
 
+try:
+    from .amr_graph import decode_amr
+    from .cache import TieredCache, make_key
+except ImportError:  # run as a script from this directory
+    from amr_graph import decode_amr
+    from cache import TieredCache, make_key
+
+# Alignment solvers: the exact ILP, hill climbing with random restarts, or
+# an ILP with a time budget that falls back to hill climbing when it cannot
+# prove an optimum in time
+SOLVERS = ("ilp", "hillclimb", "budget")
+DEFAULT_SOLVER = os.environ.get("AMR_ALIGN_SOLVER", "ilp")
+HILLCLIMB_RESTARTS = int(os.environ.get("AMR_ALIGN_RESTARTS", "4"))
+ILP_BUDGET_SECONDS = float(os.environ.get("AMR_ALIGN_BUDGET", "1.0"))
+
+# Upper bound SMATCH++ reports for solvers that do not compute one
+_NO_BOUND = 10000000
+
+# Alignment cache: in-memory LRU size and optional SQLite file for a
+# persistent tier. Bump ALIGN_CACHE_VERSION when the result format changes.
+ALIGN_CACHE_SIZE = int(os.environ.get("AMR_ALIGN_CACHE_SIZE", "1024"))
+ALIGN_CACHE_PATH = os.environ.get("AMR_ALIGN_CACHE_PATH") or None
+ALIGN_CACHE_VERSION = "1"
+
+
+class BudgetedILP(interfaces.Solver):
+    """
+    ILP limited to max_seconds. If it has not proven its alignment optimal
+    by then, hill climbing is run too and the better alignment is kept.
+    """
+
+    def __init__(self, max_seconds: float = ILP_BUDGET_SECONDS, rand_inits: int = HILLCLIMB_RESTARTS):
+        self.max_seconds = max_seconds
+        self.rand_inits = rand_inits
+
+    def _solve(self, unarymatch_dict, binarymatch_dict, V):
+        ilp = solvers.ILP(max_seconds=self.max_seconds, ignore_bad_solution_warning=True)
+        alignmat, score, bound = ilp.solve(unarymatch_dict, binarymatch_dict, V)
+        if score >= bound:
+            return alignmat, score, bound
+        climbed, climbed_score, _ = solvers.HillClimber(self.rand_inits).solve(
+            unarymatch_dict, binarymatch_dict, V
+        )
+        if climbed_score > score:
+            return climbed, climbed_score, bound
+        return alignmat, score, bound
+
+
+def make_solver(solver: str = None, restarts: int = None, budget: float = None):
+    """
+    Build a SMATCH++ alignment solver.
+
+    Parameters:
+        solver (str): One of SOLVERS (defaults to AMR_ALIGN_SOLVER, else "ilp").
+        restarts (int): Random restarts for hill climbing.
+        budget (float): Seconds the ILP may run in "budget" mode.
+    """
+    solver = solver or DEFAULT_SOLVER
+    restarts = restarts or HILLCLIMB_RESTARTS
+    budget = budget or ILP_BUDGET_SECONDS
+    if solver == "ilp":
+        return solvers.ILP()
+    if solver == "hillclimb":
+        return solvers.HillClimber(rand_inits=restarts)
+    if solver == "budget":
+        return BudgetedILP(max_seconds=budget, rand_inits=restarts)
+    raise ValueError(f"Unknown alignment solver {solver!r}; expected one of {SOLVERS}")
+
 
 class RawReader(interfaces.GraphReader):
     """
-    Return raw penman.decode(...) triples so we keep original variables & roles.
+    Return raw decoded triples so we keep original variables & roles.
+    Accepts a Penman string or an already decoded ParsedAMR.
     """
-    def _string2graph(self, penman_str: str):
-        return decode(penman_str).triples
+    def _string2graph(self, penman_str):
+        return decode_amr(penman_str).triples
 
 
 def _orig_var(tok) -> str:
@@ -29,88 +106,385 @@ def _orig_var(tok) -> str:
     return tok
 
 
-def compare_amr(amr1: str, amr2: str) -> dict:
-    # Initialize SMATCH++ with no standardization
-    measure = Smatchpp(
-        alignmentsolver    = solvers.ILP(),
-        graph_reader       = RawReader(),
-        graph_standardizer = None,
+_alignment_cache = None
+_alignment_cache_lock = threading.Lock()
+
+
+def get_alignment_cache() -> TieredCache:
+    """Return the process-wide alignment cache, creating it on first use."""
+    global _alignment_cache
+    if _alignment_cache is None:
+        with _alignment_cache_lock:
+            if _alignment_cache is None:
+                _alignment_cache = TieredCache(
+                    ALIGN_CACHE_SIZE, ALIGN_CACHE_PATH, table="alignments"
+                )
+    return _alignment_cache
+
+
+def alignment_cache_stats() -> dict:
+    """Hit/miss counters and size of the alignment cache."""
+    return get_alignment_cache().stats()
+
+
+def graph_fingerprint(amr) -> str:
+    """
+    Canonical fingerprint of an AMR: its top and sorted triples, so the same
+    graph written with different layout or triple order gets the same value.
+    """
+    graph = decode_amr(amr)
+    return make_key(graph.top, *sorted("\x1e".join(map(str, t)) for t in graph.triples))
+
+
+def _settings_fingerprint(component) -> str:
+    """Class name and simple attribute values of a solver or standardizer."""
+    if component is None:
+        return "none"
+    settings = sorted(
+        (name, value) for name, value in vars(component).items()
+        if isinstance(value, (str, int, float, bool, type(None)))
     )
+    return f"{type(component).__module__}.{type(component).__qualname__}{settings}"
+
+
+class Aligner:
+    """
+    Long-lived SMATCH++ aligner: the measure, reader and solver are built
+    once and reused for every pair.
+
+    compare_many() spreads independent pairs over a process pool of
+    `workers` processes (each holding its own Aligner with the same
+    settings), created on first use and kept until close().
+
+    Results are cached by the fingerprints of both graphs together with the
+    solver and standardizer settings. cache=True uses the shared
+    get_alignment_cache(); pass a TieredCache to use another one, or
+    False to disable caching.
+    """
+
+    def __init__(self, solver: str = None, restarts: int = None, budget: float = None,
+                 workers: int = 1, standardizer=None, cache=True):
+        self.solver = solver or DEFAULT_SOLVER
+        self.restarts = restarts
+        self.budget = budget
+        self.workers = workers
+        self.standardizer = standardizer
+        # Initialize SMATCH++ (no standardization unless one is given)
+        self.measure = Smatchpp(
+            alignmentsolver    = make_solver(self.solver, restarts, budget),
+            graph_reader       = RawReader(),
+            graph_standardizer = standardizer,
+        )
+        if cache is True:
+            cache = get_alignment_cache()
+        self.cache = cache or None
+        self._settings = (
+            ALIGN_CACHE_VERSION,
+            _settings_fingerprint(self.measure.graph_aligner.solver),
+            _settings_fingerprint(standardizer),
+        )
+        self._pool = None
+        self._pool_size = 0
+
+    def cache_key(self, amr1, amr2) -> str:
+        return make_key(*self._settings, graph_fingerprint(amr1), graph_fingerprint(amr2))
+
+    def compare(self, amr1, amr2) -> dict:
+        """
+        Align two AMRs, returning a cached result when this pair has been
+        aligned before with the same settings (see _align).
+        """
+        if self.cache is None:
+            return self._align(amr1, amr2)
+        key = self.cache_key(amr1, amr2)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        result = self._align(amr1, amr2)
+        self.cache.put(key, json.dumps(result))
+        return result
+
+    def _align(self, amr1, amr2) -> dict:
+        """
+        Align two AMRs and list their common nodes and edges.
+
+        The "alignment" entry of the result reports the solver used, the number
+        of matched triples, the upper bound on that number (None when the solver
+        gives none), whether the match is proven optimal, and the wall time.
+        """
+        # Load the raw triples
+        g1 = self.measure.graph_reader.string2graph(amr1)
+        g2 = self.measure.graph_reader.string2graph(amr2)
+
+        # Prepare & align
+        g1p, g2p, v1, v2 = self.measure.graph_pair_preparer.prepare_get_vars(g1, g2)
+        start = time.perf_counter()
+        alignment, var_index, (matched, bound) = self.measure.graph_aligner.align(g1p, g2p, v1, v2)
+        seconds = time.perf_counter() - start
+
+        # Build node mapping, stripping SMATCH++ prefixes back to original vars
+        var_map = self.measure.graph_aligner._get_var_map(alignment, var_index)
+        seen, nodes = set(), []
+        for va, vb in var_map:
+            # Skip None values
+            if va is None or vb is None:
+                continue
+            orig1 = _orig_var(va)
+            orig2 = _orig_var(vb)
+            # Skip empty strings
+            if not orig1 or not orig2:
+                continue
+            if (orig1, orig2) not in seen:
+                seen.add((orig1, orig2))
+                nodes.append((orig1, orig2))
+        common_nodes = [[a, b] for a, b in nodes]
 
-    # Load the raw triples
-    g1 = measure.graph_reader.string2graph(amr1)
-    g2 = measure.graph_reader.string2graph(amr2)
-
-    # Prepare & align
-    g1p, g2p, v1, v2 = measure.graph_pair_preparer.prepare_get_vars(g1, g2)
-    alignment, var_index, _ = measure.graph_aligner.align(g1p, g2p, v1, v2)
-
-    # Build node mapping, stripping SMATCH++ prefixes back to original vars
-    var_map = measure.graph_aligner._get_var_map(alignment, var_index)
-    seen, nodes = set(), []
-    for va, vb in var_map:
-        # Skip None values
-        if va is None or vb is None:
-            continue
-        orig1 = _orig_var(va)
-        orig2 = _orig_var(vb)
-        # Skip empty strings
-        if not orig1 or not orig2:
-            continue
-        if (orig1, orig2) not in seen:
-            seen.add((orig1, orig2))
-            nodes.append((orig1, orig2))
-    common_nodes = [[a, b] for a, b in nodes]
-
-    # Build edge mapping - keep original representation from triples
-    def normalize_edges(triples):
-        """Convert triples to normalized edges, preserving original role form"""
-        edges = []
-        for s, r, t in triples:
-            # Skip None values and instance relations
-            if s is None or r is None or t is None or r == ":instance":
+        # Build edge mapping - keep original representation from triples
+        def normalize_edges(triples):
+            """Convert triples to normalized edges, preserving original role form"""
+            edges = []
+            for s, r, t in triples:
+                # Skip None values and instance relations
+                if s is None or r is None or t is None or r == ":instance":
+                    continue
+                edges.append((s, r, t))
+            return edges
+
+        edges1 = normalize_edges(g1)
+        edges2 = normalize_edges(g2)
+
+        # Build common edges by comparing normalized forms
+        edges1_set = set(edges1)
+        edges2_set = set(edges2)
+        mapping = {k: v for k, v in nodes if k and v}  # Filter out empty strings
+
+        common_edges = []
+
+        # Check for direct matches first
+        for s1, r1, t1 in edges1:
+            # Map to corresponding nodes in g2
+            s2_mapped = mapping.get(s1, s1)
+            t2_mapped = mapping.get(t1, t1)
+
+            if (s2_mapped, r1, t2_mapped) in edges2_set:
+                common_edges.append([[s1, t1, r1], [s2_mapped, t2_mapped, r1]])
+
+        stats = {
+            "solver": self.solver,
+            "matched_triples": float(matched),
+            "upper_bound": None if bound >= _NO_BOUND else float(bound),
+            "optimal": bool(matched >= bound),
+            "seconds": round(seconds, 4),
+        }
+        return {"common_nodes": common_nodes, "common_edges": common_edges, "alignment": stats}
+
+    def compare_many(self, pairs, workers: int = None, return_exceptions: bool = False) -> list[dict]:
+        """
+        Align many (amr1, amr2) pairs, in parallel when workers > 1.
+
+        Parameters:
+            pairs (List[Tuple[str, str]]): Pairs of Penman strings (or ParsedAMR).
+            workers (int): Overrides the worker count given to the constructor.
+            return_exceptions (bool): Give a pair that fails an {"error": ...}
+                result instead of raising.
+
+        Returns:
+            List[dict]: compare() results in input order.
+        """
+        workers = workers or self.workers
+        if workers <= 1 or len(pairs) <= 1:
+            return [_compare_safely(self, a, b, return_exceptions) for a, b in pairs]
+
+        # Look pairs up in the cache here; workers only align the misses
+        results = [None] * len(pairs)
+        keys = [None] * len(pairs)
+        if self.cache is not None:
+            for i, (a, b) in enumerate(pairs):
+                try:
+                    keys[i] = self.cache_key(a, b)
+                except Exception:
+                    continue  # unparsable graph; let the worker report it
+                cached = self.cache.get(keys[i])
+                if cached is not None:
+                    results[i] = json.loads(cached)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        # Send Penman text: a ParsedAMR carries the same text plus its
+        # decoded triples, and workers decode through their own cache anyway
+        tasks = [(str(pairs[i][0]), str(pairs[i][1]), return_exceptions) for i in missing]
+        pool = self._get_pool(workers)
+        chunksize = max(1, len(tasks) // (workers * 4))
+        for i, result in zip(missing, pool.starmap(_compare_in_worker, tasks, chunksize=chunksize)):
+            results[i] = result
+            if keys[i] is not None and "error" not in result:
+                self.cache.put(keys[i], json.dumps(result))
+        return results
+
+    def _get_pool(self, workers: int):
+        if self._pool is not None and self._pool_size != workers:
+            self.close()
+        if self._pool is None:
+            self._pool = Pool(
+                workers,
+                initializer=_init_worker,
+                initargs=(self.solver, self.restarts, self.budget, self.standardizer),
+            )
+            self._pool_size = workers
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_worker_aligner = None
+
+
+def _init_worker(solver, restarts, budget, standardizer):
+    global _worker_aligner
+    # The parent process owns the cache
+    _worker_aligner = Aligner(solver, restarts, budget, standardizer=standardizer, cache=False)
+
+
+def _compare_safely(aligner: Aligner, amr1, amr2, return_exceptions: bool) -> dict:
+    if not return_exceptions:
+        return aligner.compare(amr1, amr2)
+    try:
+        return aligner.compare(amr1, amr2)
+    except Exception as e:
+        return {"error": f"Alignment failed: {e}"}
+
+
+def _compare_in_worker(amr1: str, amr2: str, return_exceptions: bool = False) -> dict:
+    return _compare_safely(_worker_aligner, amr1, amr2, return_exceptions)
+
+
+@lru_cache(maxsize=None)
+def get_aligner(solver: str = None, restarts: int = None, budget: float = None) -> Aligner:
+    """Return the shared single-process Aligner for these solver settings."""
+    return Aligner(solver, restarts, budget)
+
+
+def compare_amr(amr1, amr2, solver: str = None, restarts: int = None, budget: float = None) -> dict:
+    """Align two AMRs with the shared Aligner for the given solver settings (see Aligner.compare)."""
+    return get_aligner(solver or DEFAULT_SOLVER, restarts, budget).compare(amr1, amr2)
+
+
+def iter_graph_pairs(path1: str, path2: str):
+    """
+    Stream (id, amr1, amr2) from two blank-line separated multi-graph AMR
+    files, pairing the n-th graph of one with the n-th graph of the other.
+    The id is the first graph's "# ::id" metadata, else its position.
+    """
+    with open(path1, encoding="utf-8") as f1, open(path2, encoding="utf-8") as f2:
+        graphs1, graphs2 = penman.iterdecode(f1), penman.iterdecode(f2)
+        for index, (g1, g2) in enumerate(zip_longest(graphs1, graphs2)):
+            if g1 is None or g2 is None:
+                shorter = path1 if g1 is None else path2
+                print(f"Warning: {shorter} ran out of graphs after {index} pairs", file=sys.stderr)
+                return
+            yield g1.metadata.get("id", str(index)), penman.encode(g1), penman.encode(g2)
+
+
+def iter_manifest_pairs(path: str):
+    """
+    Stream (id, amr1, amr2) from a manifest of tab-separated
+    "[id<TAB>]amr1_path<TAB>amr2_path" lines, with paths relative to the
+    manifest. Each referenced file holds a single graph.
+    """
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            fields = line.rstrip("\n").split("\t")
+            if not line.strip() or line.startswith("#"):
                 continue
-            edges.append((s, r, t))
-        return edges
-    
-    edges1 = normalize_edges(g1)
-    edges2 = normalize_edges(g2)
-    
-    # Build common edges by comparing normalized forms
-    edges1_set = set(edges1)
-    edges2_set = set(edges2)
-    mapping = {k: v for k, v in nodes if k and v}  # Filter out empty strings
-    
-    common_edges = []
-    
-    # Check for direct matches first
-    for s1, r1, t1 in edges1:
-        # Map to corresponding nodes in g2
-        s2_mapped = mapping.get(s1, s1)
-        t2_mapped = mapping.get(t1, t1)
-        
-        if (s2_mapped, r1, t2_mapped) in edges2_set:
-            common_edges.append([[s1, t1, r1], [s2_mapped, t2_mapped, r1]])
-    
-    return {"common_nodes": common_nodes, "common_edges": common_edges}
+            pair_id = fields[0] if len(fields) == 3 else str(line_no)
+            amrs = []
+            for amr_path in fields[-2:]:
+                with open(os.path.join(base, amr_path), encoding="utf-8") as amr_file:
+                    amrs.append(amr_file.read().strip())
+            yield pair_id, amrs[0], amrs[1]
+
+
+def align_corpus(records, output: str, aligner: Aligner, window: int = 256) -> tuple[int, int]:
+    """
+    Align a stream of (id, amr1, amr2) records and write one JSONL line per
+    pair, in input order. Records are consumed `window` pairs at a time so
+    only that many graphs are held in memory.
+
+    Returns:
+        Tuple[int, int]: Pairs written and pairs that failed.
+    """
+    written = failed = 0
+    with open(output, "w", encoding="utf-8") as out:
+        while True:
+            batch = list(islice(records, window))
+            if not batch:
+                break
+            results = aligner.compare_many([(a, b) for _, a, b in batch], return_exceptions=True)
+            for (pair_id, _, _), result in zip(batch, results):
+                out.write(json.dumps(dict(id=pair_id, **result)) + "\n")
+                failed += "error" in result
+            written += len(batch)
+            print(f"\r{written} pairs aligned ({failed} failed)", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    return written, failed
 
 
 def main():
     p = argparse.ArgumentParser(description="Auto‐generate alignment.json")
-    p.add_argument("--amr1",   required=True, help="First AMR file")
-    p.add_argument("--amr2",   required=True, help="Second AMR file")
+    p.add_argument("--amr1",   help="First AMR file")
+    p.add_argument("--amr2",   help="Second AMR file")
+    p.add_argument("--manifest", help="TSV of [id] amr1_path amr2_path lines; writes JSONL")
+    p.add_argument("--batch", action="store_true",
+                   help="Treat --amr1/--amr2 as multi-graph corpora aligned graph by graph; writes JSONL")
     p.add_argument("--output", default="alignment.json", help="Output JSON path")
+    p.add_argument("--workers", type=int, default=1, help="Worker processes for --batch/--manifest")
+    p.add_argument("--solver", choices=SOLVERS, default=None, help="Alignment solver (default: AMR_ALIGN_SOLVER or ilp)")
+    p.add_argument("--restarts", type=int, default=None, help="Random restarts for hill climbing")
+    p.add_argument("--budget", type=float, default=None, help="ILP time budget in seconds for --solver budget")
+    p.add_argument("--no-cache", action="store_true", help="Always realign instead of using the alignment cache")
     args = p.parse_args()
+    cache = not args.no_cache
+
+    if args.manifest or args.batch:
+        if args.manifest:
+            records = iter_manifest_pairs(args.manifest)
+        elif args.amr1 and args.amr2:
+            records = iter_graph_pairs(args.amr1, args.amr2)
+        else:
+            p.error("--batch needs --amr1 and --amr2")
+        start = time.perf_counter()
+        with Aligner(args.solver, args.restarts, args.budget, workers=args.workers, cache=cache) as aligner:
+            written, failed = align_corpus(records, args.output, aligner, window=max(64, args.workers * 64))
+        elapsed = time.perf_counter() - start
+        print(f"Wrote {written} alignments ({failed} failed) to {args.output} in {elapsed:.1f} s")
+        return
+    if not (args.amr1 and args.amr2):
+        p.error("--amr1 and --amr2 are required (or use --manifest)")
 
     s1 = open(args.amr1, encoding="utf-8").read().strip()
     s2 = open(args.amr2, encoding="utf-8").read().strip()
 
-    alignment = compare_amr(s1, s2)
+    alignment = Aligner(args.solver, args.restarts, args.budget, cache=cache).compare(s1, s2)
     with open(args.output, "w", encoding="utf-8") as f:
         json.dump(alignment, f, indent=2)
 
     print(f"Wrote alignment to {args.output}")
     print(f"Found {len(alignment['common_nodes'])} common nodes and {len(alignment['common_edges'])} common edges")
+    stats = alignment["alignment"]
+    print(f"{stats['solver']}: {stats['matched_triples']:.0f} matched triples "
+          f"(optimal: {stats['optimal']}) in {stats['seconds']:.3f} s")
 
 
 if __name__ == "__main__":
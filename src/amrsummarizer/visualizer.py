@@ -1,7 +1,80 @@
 import argparse
-from amr2nx import load_amr_graph
-from annotate import annotate_overlap
-from networkx.drawing.nx_pydot import to_pydot
+import os
+import subprocess
+
+try:
+    from .amr2nx import load_amr_graph
+    from .annotate import annotate_overlap
+except ImportError:  # run as a script from this directory
+    from amr2nx import load_amr_graph
+    from annotate import annotate_overlap
+
+# Graphviz executable used to lay out the DOT text
+DOT_BINARY = os.environ.get("AMR_DOT_BINARY", "dot")
+
+SVG_HEADER = b"<?xml"
+
+OVERLAP_NODE = 'color="red", style="filled", fillcolor="pink"'
+PLAIN_NODE = 'color="grey"'
+OVERLAP_EDGE = 'color="red", penwidth="2"'
+PLAIN_EDGE = 'color="grey", penwidth="1"'
+
+
+def _quote(value) -> str:
+    """Quote a value as a DOT ID."""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def graph_to_dot(G, name: str = "G") -> str:
+    """
+    Write DOT text for an annotated AMR graph in one pass over its nodes
+    and edges: overlapping nodes are filled pink with a red border and
+    overlapping edges are drawn red and thicker, everything else grey.
+    """
+    lines = [f"digraph {_quote(name)} {{"]
+    for node_id, attrs in G.nodes(data=True):
+        style = OVERLAP_NODE if attrs.get("overlap", False) else PLAIN_NODE
+        label = attrs.get("label", node_id)
+        lines.append(f"{_quote(node_id)} [label={_quote(label)}, {style}];")
+    for src, dst, attrs in G.edges(data=True):
+        style = OVERLAP_EDGE if attrs.get("overlap", False) else PLAIN_EDGE
+        lines.append(f"{_quote(src)} -> {_quote(dst)} [{style}];")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _run_dot(dot_text: str) -> bytes:
+    result = subprocess.run(
+        [DOT_BINARY, "-Tsvg"], input=dot_text.encode("utf-8"), capture_output=True, check=False
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Graphviz failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return result.stdout
+
+
+def render_svg(G) -> bytes:
+    """Render an annotated graph to SVG bytes, piping DOT through Graphviz (no temp files)."""
+    return _run_dot(graph_to_dot(G))
+
+
+def render_many(graphs) -> list[bytes]:
+    """
+    Render several annotated graphs with a single Graphviz invocation.
+
+    Returns:
+        List[bytes]: One SVG document per graph, in input order.
+    """
+    graphs = list(graphs)
+    if not graphs:
+        return []
+    dot_text = "\n".join(graph_to_dot(G, name=f"G{i}") for i, G in enumerate(graphs))
+    output = _run_dot(dot_text)
+    # dot writes one complete SVG document per input graph, back to back
+    documents = [SVG_HEADER + part for part in output.split(SVG_HEADER)[1:]]
+    if len(documents) != len(graphs):
+        raise RuntimeError(f"Graphviz returned {len(documents)} SVGs for {len(graphs)} graphs")
+    return documents
 
 
 def render_graph(G, output_path):
@@ -9,33 +82,7 @@ def render_graph(G, output_path):
     Render a single AMR graph G (with 'overlap' attributes)
     to an SVG file at output_path.
     """
-    p = to_pydot(G)
-    for node_dot in p.get_nodes():
-        name = node_dot.get_name().strip('"')
-        if name not in G.nodes:
-            continue
-        attrs = G.nodes[name]
-        if attrs.get("overlap", False):
-            node_dot.set_color("red")
-            node_dot.set_style("filled")
-            node_dot.set_fillcolor("pink")
-        else:
-            node_dot.set_color("grey")
-    for edge_dot in p.get_edges():
-        src = edge_dot.get_source().strip('"')
-        dst = edge_dot.get_destination().strip('"')
-
-        if not G.has_edge(src, dst):
-            continue
-        edge_attributes = G.edges[src, dst]
-
-        if edge_attributes.get("overlap", False):
-            edge_dot.set_color("red")
-            edge_dot.set_penwidth("2")
-        else:
-            edge_dot.set_color("grey")
-            edge_dot.set_penwidth("1")
-    svg_data_bytes = p.create(format="svg")
+    svg_data_bytes = render_svg(G)
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(svg_data_bytes.decode("utf-8"))
     print(f"Wrote {output_path}")
@@ -57,9 +104,11 @@ def main():
     g2 = load_amr_graph(open(args.amr2, encoding="utf-8").read())
     annotate_overlap(g1, g2, args.alignment)
 
-    # render both
-    render_graph(g1, args.out1)
-    render_graph(g2, args.out2)
+    # render both with one Graphviz call
+    for output_path, svg in zip((args.out1, args.out2), render_many([g1, g2])):
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(svg.decode("utf-8"))
+        print(f"Wrote {output_path}")
 
 
 if __name__ == "__main__":
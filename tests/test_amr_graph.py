@@ -0,0 +1,90 @@
+import gc
+import tracemalloc
+
+import penman
+
+from amrsummarizer.amr2nx import load_amr_graph
+from amrsummarizer.amr_graph import ParsedAMR, decode_amr
+from amrsummarizer.metrics import is_factually_consistent, smatch_f1, smatch_f1_matrix
+
+AMR = """
+(w / want-01
+   :ARG0 (b / boy)
+   :ARG1 (g / go-02
+            :ARG0 b
+            :destination (c / city
+                            :name (n / name :op1 "New" :op2 "York"))
+            :quant 5))
+"""
+
+
+def test_parsed_amr_matches_penman_graph():
+    graph = penman.decode(AMR)
+    parsed = decode_amr(AMR)
+
+    assert parsed.triples == graph.triples
+    assert parsed.top == graph.top
+    assert parsed.variables() == graph.variables()
+    assert parsed.instances() == [tuple(t) for t in graph.instances()]
+    assert parsed.edges() == [tuple(t) for t in graph.edges()]
+    assert parsed.attributes() == [tuple(t) for t in graph.attributes()]
+    assert parsed.to_graph() == graph
+
+
+def test_decode_amr_decodes_each_string_once():
+    first = decode_amr(AMR)
+    assert decode_amr(AMR) is first
+    assert decode_amr(first) is first
+    assert isinstance(first, ParsedAMR)
+
+
+def test_consumers_accept_parsed_amr():
+    parsed = decode_amr(AMR)
+    assert smatch_f1(parsed, AMR) == 1.0
+    assert is_factually_consistent(parsed, [parsed]) == (True, 1.0)
+
+    from_string = load_amr_graph(AMR)
+    from_parsed = load_amr_graph(parsed)
+    assert dict(from_string.nodes(data=True)) == dict(from_parsed.nodes(data=True))
+    assert list(from_string.edges(data=True)) == list(from_parsed.edges(data=True))
+
+
+def test_symbols_are_released_with_their_graphs():
+    # Names, constants and numbers from user input must not outlive the
+    # decoded graphs that use them
+    def person(i):
+        return f'(p / person :name (n / name :op1 "Person{i}") :age {i})'
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for i in range(5000):
+        parsed = ParsedAMR(person(i))
+        assert ("n", ":op1", f'"Person{i}"') in parsed.triples
+    del parsed
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert after - before < 50_000
+
+
+def test_graphs_with_different_symbol_tables_still_compare():
+    renamed = "(x / want-01 :ARG0 (y / boy) :ARG1 (z / city))"
+    original = "(w / want-01 :ARG0 (b / boy) :ARG1 (c / city))"
+    assert smatch_f1(original, renamed, mode="concept") == 1.0
+    assert smatch_f1_matrix([original], [renamed, original], mode="raw")[0, 1] == 1.0
+
+
+def test_concept_named_like_a_variable_stays_a_concept():
+    # The pronoun concept "i" is spelled like the variable of "idea"
+    amr = "(c / come-01 :ARG1 (i / idea) :ARG2 (i2 / i))"
+    renamed = "(x / come-01 :ARG1 (y / idea) :ARG2 (z / i))"
+    parsed = ParsedAMR(amr)
+    graph = penman.decode(amr)
+
+    assert ("idea", ":instance", "idea") in parsed.concept_triples()
+    assert ("i", ":instance", "i") in parsed.concept_triples()
+    assert smatch_f1(amr, renamed, mode="concept") == 1.0
+    assert parsed.variables() == graph.variables()
+    assert parsed.edges() == [tuple(t) for t in graph.edges()]
+    assert parsed.attributes() == [tuple(t) for t in graph.attributes()]
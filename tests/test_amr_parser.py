@@ -0,0 +1,160 @@
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from amrsummarizer import amr_parser
+from amrsummarizer.amr_parser import AMRParser
+from amrsummarizer.cache import TieredCache
+
+
+class StubStog:
+    """Minimal stand-in for an amrlib stog model."""
+
+    def __init__(self):
+        self.model = self
+        self.calls = []
+
+    def to(self, device):
+        return self
+
+    def parse_sents(self, sents):
+        self.calls.append(list(sents))
+        return [f"(s / sentence :value \"{s}\")" for s in sents]
+
+
+@pytest.fixture(autouse=True)
+def fresh_shared_state(monkeypatch):
+    """Give every test its own shared parser and an empty parse cache."""
+    monkeypatch.setattr(amr_parser, "_parser", None)
+    monkeypatch.setattr(amr_parser, "_parse_cache", TieredCache(maxsize=16))
+    monkeypatch.setattr(amr_parser, "_scheduler", None)
+
+
+def _patch_loader(monkeypatch):
+    loaded = []
+
+    def fake_load_stog_model(model_dir=None, **kwargs):
+        stog = StubStog()
+        loaded.append((model_dir, stog))
+        return stog
+
+    # amr_parser imports amrlib and torch lazily, so stub them in sys.modules
+    monkeypatch.setitem(
+        sys.modules, "amrlib", SimpleNamespace(load_stog_model=fake_load_stog_model)
+    )
+    monkeypatch.setitem(
+        sys.modules, "torch", SimpleNamespace(cuda=SimpleNamespace(empty_cache=lambda: None))
+    )
+    return loaded
+
+
+def test_parser_loads_model_once(monkeypatch):
+    loaded = _patch_loader(monkeypatch)
+    parser = AMRParser(model_dir="/models/a")
+
+    parser.parse_sents(["One."])
+    parser.parse_sents(["Two.", "Three."])
+
+    assert len(loaded) == 1
+    assert loaded[0][0] == "/models/a"
+    assert loaded[0][1].calls == [["One."], ["Two.", "Three."]]
+
+
+def test_parser_unload_and_reload(monkeypatch):
+    loaded = _patch_loader(monkeypatch)
+    parser = AMRParser(model_dir="/models/a")
+
+    parser.warmup()
+    assert parser.is_loaded
+    parser.unload()
+    assert not parser.is_loaded
+
+    parser.reload(model_dir="/models/b")
+    assert parser.is_loaded
+    assert [path for path, _ in loaded] == ["/models/a", "/models/b"]
+
+
+def test_parse_amr_uses_shared_parser(monkeypatch):
+    loaded = _patch_loader(monkeypatch)
+
+    amr_parser.parse_amr("First.")
+    amr_parser.parse_amr("Second.")
+
+    assert len(loaded) == 1
+
+
+def test_parse_batch_keeps_input_order_and_chunks(monkeypatch):
+    loaded = _patch_loader(monkeypatch)
+    parser = AMRParser(model_dir="/models/a", batch_size=2)
+    texts = ["A much longer sentence here.", "Short.", "Medium one."]
+
+    graphs = parser.parse_batch(texts)
+
+    assert graphs == [f"(s / sentence :value \"{t}\")" for t in texts]
+    # Sorted by length, then split into chunks of at most two sentences
+    assert loaded[0][1].calls == [
+        ["Short.", "Medium one."],
+        ["A much longer sentence here."],
+    ]
+
+
+def test_parse_cache_hit_skips_model(monkeypatch):
+    loaded = _patch_loader(monkeypatch)
+
+    first = amr_parser.parse_amr_batch(["Cats  sleep.", "Dogs bark."])
+    second = amr_parser.parse_amr_batch(["Cats sleep.", "Dogs bark.", "Dogs bark."])
+
+    stog = loaded[0][1]
+    assert stog.calls == [["Dogs bark.", "Cats sleep."]]
+    assert second[:2] == first
+    stats = amr_parser.parse_cache_stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 2
+
+
+def test_parse_cache_disk_tier_survives_restart(monkeypatch, tmp_path):
+    loaded = _patch_loader(monkeypatch)
+    path = str(tmp_path / "parses.sqlite")
+    monkeypatch.setattr(amr_parser, "_parse_cache", TieredCache(4, path, "amr_parses"))
+    amr_parser.parse_amr("Birds sing.")
+
+    # A new process starts with an empty memory tier but the same file
+    monkeypatch.setattr(amr_parser, "_parse_cache", TieredCache(4, path, "amr_parses"))
+    amr_parser.parse_amr("Birds sing.")
+
+    assert loaded[0][1].calls == [["Birds sing."]]
+    assert amr_parser.parse_cache_stats()["disk_hits"] == 1
+
+
+def test_amr_to_svg_is_cached_by_penman_and_style(monkeypatch):
+    rendered = []
+
+    def fake_render(graph):
+        rendered.append(graph.text)
+        return f"<svg>{len(rendered)}</svg>"
+
+    monkeypatch.setattr(amr_parser, "_svg_cache", None)
+    monkeypatch.setattr(amr_parser, "_render_svg", fake_render)
+    amr = "(b / bark-01 :ARG0 (d / dog))"
+
+    assert amr_parser.amr_to_svg(amr) == "<svg>1</svg>"
+    assert amr_parser.amr_to_svg(amr) == "<svg>1</svg>"
+    monkeypatch.setitem(amr_parser.SVG_EDGE_STYLE, "color", "black")
+    assert amr_parser.amr_to_svg(amr) == "<svg>2</svg>"
+    assert amr_parser.svg_cache_stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("max_wait_ms", [5.0, 0.0])
+def test_parse_amr_batch_reports_each_result(monkeypatch, max_wait_ms):
+    _patch_loader(monkeypatch)
+    monkeypatch.setattr(amr_parser, "SCHEDULER_MAX_WAIT_MS", max_wait_ms)
+    amr_parser.parse_amr("Cats sleep.")
+
+    reported = []
+    graphs = amr_parser.parse_amr_batch(
+        ["Cats sleep.", "Dogs bark.", "Dogs bark."], on_result=lambda i, g: reported.append((i, g))
+    )
+    # The cache hit is reported first, then every position of each parsed text
+    assert reported[0] == (0, graphs[0])
+    assert sorted(reported) == list(enumerate(graphs))
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from amrsummarizer.batching import MicroBatcher
+
+
+class StubModel:
+    """Records the batches it receives and echoes inputs back in upper case."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, items):
+        self.batches.append(list(items))
+        return [item.upper() for item in items]
+
+
+def test_concurrent_submissions_share_one_batch():
+    model = StubModel()
+    batcher = MicroBatcher(model, max_batch_size=4, max_wait_ms=2000)
+    results = {}
+
+    def worker(text):
+        results[text] = batcher.map([text])[0]
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in "abcd"]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+    batcher.close()
+
+    # The size limit flushes the batch long before the 2 s deadline
+    assert len(model.batches) == 1
+    assert sorted(model.batches[0]) == ["a", "b", "c", "d"]
+    assert results == {"a": "A", "b": "B", "c": "C", "d": "D"}
+
+
+def test_deadline_flushes_partial_batch():
+    model = StubModel()
+    batcher = MicroBatcher(model, max_batch_size=8, max_wait_ms=10)
+
+    assert batcher.map(["x", "y"]) == ["X", "Y"]
+    batcher.close()
+    assert model.batches == [["x", "y"]]
+    assert batcher.stats()["items"] == 2
+
+
+def test_large_submission_is_split_by_max_batch_size():
+    model = StubModel()
+    batcher = MicroBatcher(model, max_batch_size=2, max_wait_ms=10)
+
+    assert batcher.map(["a", "b", "c"]) == ["A", "B", "C"]
+    batcher.close()
+    assert model.batches == [["a", "b"], ["c"]]
+
+
+def test_model_errors_reach_every_caller_in_the_batch():
+    def failing(items):
+        raise RuntimeError("model crashed")
+
+    batcher = MicroBatcher(failing, max_batch_size=2, max_wait_ms=10)
+    futures = batcher.submit_many(["a", "b"])
+    for future in futures:
+        with pytest.raises(RuntimeError, match="model crashed"):
+            future.result(timeout=5)
+    batcher.close()
@@ -0,0 +1,59 @@
+import numpy as np
+
+from amrsummarizer.cache import LRUCache, TieredCache, VectorCache, make_key
+
+
+def test_make_key_is_stable_and_part_sensitive():
+    assert make_key("model", "text") == make_key("model", "text")
+    assert make_key("model", "text") != make_key("modelt", "ext")
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" is now the most recently used
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    TieredCache(maxsize=2, path=path).put("k", "value")
+
+    cache = TieredCache(maxsize=2, path=path)
+    assert cache.get("k") == "value"
+    assert cache.get("k") == "value"
+    stats = cache.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 0
+
+
+def test_vector_cache_stores_rows_contiguously():
+    cache = VectorCache(maxsize=2, dtype="float16", initial_capacity=1)
+    cache.put_many([1, 2], np.array([[1.0, 2.0], [3.0, 4.0]]))
+
+    vectors, found = cache.lookup([2, 3, 1])
+    assert found.tolist() == [True, False, True]
+    assert vectors.dtype == np.float32
+    np.testing.assert_array_equal(vectors[[0, 2]], [[3.0, 4.0], [1.0, 2.0]])
+    # Two float16 rows of dimension two in a single array
+    assert cache.stats()["nbytes"] == 2 * 2 * 2
+    assert cache.stats()["hits"] == 2
+
+
+def test_vector_cache_evicts_least_recently_used():
+    cache = VectorCache(maxsize=2)
+    cache.put_many([1, 2], np.eye(2))
+    cache.lookup([1])
+    cache.put_many([3], np.ones((1, 2)))
+
+    _, found = cache.lookup([1, 2, 3])
+    assert found.tolist() == [True, False, True]
+    assert len(cache) == 2
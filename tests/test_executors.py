@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+import pytest
+
+from amrsummarizer.executors import StageExecutor, StageOverloaded
+from amrsummarizer.instrumentation import format_timings, metrics, stage_timer, start_request_timings
+
+
+def test_stage_executor_runs_off_the_event_loop():
+    executor = StageExecutor("test", max_workers=1, max_queue=0)
+    loop_thread = threading.get_ident()
+
+    async def main():
+        return await executor.run(threading.get_ident)
+
+    assert asyncio.run(main()) != loop_thread
+    assert executor.stats()["in_flight"] == 0
+    executor.shutdown()
+
+
+def test_stage_executor_rejects_when_backlog_is_full():
+    executor = StageExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def main():
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(StageOverloaded) as info:
+            await executor.run(release.wait)
+        release.set()
+        await asyncio.gather(*running)
+        return info.value
+
+    error = asyncio.run(main())
+    assert error.stage == "test"
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+
+def test_stage_timer_feeds_histograms_and_request_timings():
+    timings = start_request_timings()
+    for seconds in (0.002, 0.02, 0.2):
+        metrics.observe_stage("test-timer", seconds)
+    with stage_timer("test-timer"):
+        pass
+
+    assert timings["test-timer"] >= 0.222
+    histogram = metrics.stage_seconds["test-timer"]
+    assert histogram.count == 4
+    buckets = dict(histogram.cumulative())
+    assert buckets["0.005"] >= 2 and buckets["0.025"] >= 3 and buckets["+Inf"] == 4
+    assert format_timings({"parse": 0.0412}, 0.0803) == "parse;dur=41.2, total;dur=80.3"
+
+
+def test_cancelled_call_keeps_its_slot_until_it_finishes():
+    executor = StageExecutor("test", max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def main():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        await asyncio.sleep(0)
+        # The thread is still busy, so the stage is still full
+        assert executor.stats()["in_flight"] == 1
+        with pytest.raises(StageOverloaded):
+            await executor.run(release.wait)
+        release.set()
+        for _ in range(100):
+            if executor.stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert executor.stats()["in_flight"] == 0
+    executor.shutdown()
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 from amrsummarizer.main import app
@@ -53,3 +55,36 @@ def test_process_amr_ok():
     assert "<svg" in data["summary_svg"]
     # top_sentence_svgs should be a dictionary mapping sentences to SVG strings
     assert isinstance(data["top_sentence_svgs"], dict)
+
+
+def test_ready_reports_model_status():
+    """
+    /ready lists the load state of every model and only returns 200
+    once all of them are loaded.
+    """
+    res = client.get("/ready")
+    body = res.json()
+    assert set(body["models"]) == {"segmenter", "embedder", "amr_parser"}
+    assert res.status_code == (200 if body["ready"] else 503)
+
+
+def test_ready_reports_failed_warmup(monkeypatch, caplog, tmp_path):
+    """A model that fails to load is logged and named in the /ready body."""
+    from amrsummarizer import main
+
+    monkeypatch.setattr(main, "JOB_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+
+    def broken_warmup():
+        raise OSError("no model in /missing")
+
+    monkeypatch.setattr(main, "WARMUP_ON_STARTUP", True)
+    monkeypatch.setattr(main, "warm_up_models", broken_warmup)
+    monkeypatch.setattr(main, "_warmup_error", None)
+    with TestClient(app) as startup_client:
+        for _ in range(100):
+            body = startup_client.get("/ready").json()
+            if "error" in body:
+                break
+            time.sleep(0.01)
+    assert body["error"] == "OSError: no model in /missing"
+    assert "Model warm-up failed" in caplog.text
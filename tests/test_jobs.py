@@ -0,0 +1,173 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from amrsummarizer import main
+from amrsummarizer.jobs import DONE, FAILED, QUEUED, JobRunner, JobStore, job_id
+
+RESULT = {"top_sentences": ["Dogs bark."], "consistency_score": 1.0, "is_consistent": True}
+
+
+def wait_for(store, run_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = store.get(run_id)
+        if job["status"] in (DONE, FAILED):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {run_id} did not finish")
+
+
+def test_runner_dedups_by_content_and_persists(tmp_path):
+    calls = []
+
+    def check(summary, article):
+        calls.append(summary)
+        return {"error": "Summary is required."} if summary == "bad" else RESULT
+
+    path = str(tmp_path / "jobs.sqlite3")
+    runner = JobRunner(JobStore(path), check)
+    first = runner.submit({"summary": "Dogs bark.", "article": "Dogs bark. Cats sleep."})
+    assert first["job_id"] == job_id("Dogs bark.", "Dogs bark. Cats sleep.")
+    assert wait_for(runner.store, first["job_id"])["result"] == RESULT
+
+    again = runner.submit({"summary": "Dogs bark.", "article": "Dogs bark. Cats sleep."})
+    assert again["job_id"] == first["job_id"] and again["status"] == DONE
+    failed = runner.submit({"summary": "bad", "article": "x"})
+    assert wait_for(runner.store, failed["job_id"])["error"] == "Summary is required."
+    runner.shutdown(wait=True)
+    assert calls == ["Dogs bark.", "bad"]
+
+    # A new process sees the stored results
+    assert JobStore(path).get(first["job_id"])["status"] == DONE
+
+
+def test_unfinished_jobs_resume_on_start(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    pending_id = job_id("Dogs bark.", "Dogs bark.")
+    store.create(pending_id, {"summary": "Dogs bark.", "article": "Dogs bark."})
+    assert store.get(pending_id)["status"] == QUEUED
+
+    runner = JobRunner(store, lambda summary, article: RESULT)
+    assert wait_for(store, pending_id)["status"] == DONE
+    runner.shutdown(wait=True)
+
+
+@pytest.fixture
+def job_client(tmp_path, monkeypatch):
+    runner = JobRunner(JobStore(str(tmp_path / "jobs.sqlite3")), lambda summary, article: RESULT)
+    monkeypatch.setattr(main, "_job_runner", runner)
+    yield TestClient(main.app)
+    runner.shutdown(wait=True)
+
+
+def test_jobs_endpoints(job_client):
+    long_article = "Dogs bark. " * 2000  # beyond the synchronous MAX_ARTICLE_LENGTH
+    resp = job_client.post("/jobs", json={"summary": "Dogs bark.", "article": long_article})
+    assert resp.status_code == 202
+    created = resp.json()
+    assert created["status"] in (QUEUED, "running", DONE)
+
+    job = wait_for(main._job_runner.store, created["job_id"])
+    resp = job_client.get(f"/jobs/{created['job_id']}")
+    assert resp.status_code == 200
+    assert resp.json()["result"] == RESULT == job["result"]
+
+    assert job_client.get("/jobs/unknown").status_code == 404
+    assert job_client.post("/jobs", json={"summary": " ", "article": "x"}).status_code == 400
+
+
+def test_job_runner_is_created_once_under_concurrency(tmp_path, monkeypatch):
+    created = []
+
+    class SlowRunner(JobRunner):
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.05)
+            created.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(main, "JOB_DB_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(main, "JobRunner", SlowRunner)
+    monkeypatch.setattr(main, "_job_runner", None)
+    threads = [threading.Thread(target=main.get_job_runner) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(created) == 1 and main._job_runner is created[0]
+    created[0].shutdown(wait=True)
+
+
+def test_unfinished_jobs_resume_at_startup(tmp_path, monkeypatch):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(path)
+    pending_id = job_id(summary="Dogs bark.", article="Dogs bark.")
+    store.create(pending_id, {"summary": "Dogs bark.", "article": "Dogs bark."})
+    store.close()
+
+    monkeypatch.setattr(main, "JOB_DB_PATH", path)
+    monkeypatch.setattr(main, "WARMUP_ON_STARTUP", False)
+    monkeypatch.setattr(main, "check_consistency", lambda summary, article: RESULT)
+    monkeypatch.setattr(main, "_job_runner", None)
+    # No /jobs request is made: starting the app is enough
+    with TestClient(main.app):
+        job = wait_for(main._job_runner.store, pending_id)
+    assert job["status"] == DONE and job["result"] == RESULT
+    assert main._job_runner is None
+
+
+def test_runners_sharing_a_store_run_a_job_once(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(path)
+    pending_id = job_id("Dogs bark.", "Dogs bark.")
+    store.create(pending_id, {"summary": "Dogs bark.", "article": "Dogs bark."})
+    calls = []
+
+    def slow_check(summary, article):
+        calls.append(summary)
+        time.sleep(0.05)
+        return RESULT
+
+    # One runner per "process", each with its own connection
+    runners = [JobRunner(JobStore(path), slow_check) for _ in range(3)]
+    assert wait_for(store, pending_id)["status"] == DONE
+    for runner in runners:
+        runner.shutdown(wait=True)
+    assert calls == ["Dogs bark."]
+
+
+def test_expired_lease_lets_another_runner_take_over(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    pending_id = job_id("Dogs bark.", "Dogs bark.")
+    store.create(pending_id, {"summary": "Dogs bark.", "article": "Dogs bark."})
+
+    # A runner claims the job and then dies without finishing it
+    assert store.claim(pending_id, lease=0.1)
+    assert not store.claim(pending_id, lease=0.1)
+    assert store.claimable() == []
+
+    runner = JobRunner(store, lambda summary, article: RESULT, lease=0.1)
+    assert wait_for(store, pending_id)["status"] == DONE
+    runner.shutdown(wait=True)
+    assert not store.claim(pending_id)
+
+
+def test_running_job_keeps_its_lease(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    calls = []
+
+    def slow_check(summary, article):
+        calls.append(summary)
+        time.sleep(0.3)
+        return RESULT
+
+    runner = JobRunner(store, slow_check, lease=0.1)
+    created = runner.submit({"summary": "Dogs bark.", "article": "Dogs bark."})
+    time.sleep(0.15)
+    # The lease is renewed while the job runs, so nobody else can claim it
+    assert not store.claim(created["job_id"], lease=0.1)
+    assert wait_for(store, created["job_id"])["status"] == DONE
+    runner.shutdown(wait=True)
+    assert calls == ["Dogs bark."]
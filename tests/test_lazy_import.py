@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+
+def test_importing_main_does_not_load_models():
+    """
+    Importing the app must not pull in torch, amrlib, spaCy or
+    SentenceTransformer; models are loaded on first use or at startup.
+    """
+    code = (
+        "import sys\n"
+        "import amrsummarizer.main\n"
+        "heavy = ['torch', 'amrlib', 'spacy', 'sentence_transformers', 'graphviz']\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    # Run in a fresh interpreter that sees the same package path as pytest
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env
+    )
+    assert result.stdout.strip() == ""
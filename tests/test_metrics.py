@@ -1,3 +1,5 @@
+import pytest
+
 from amrsummarizer.metrics import smatch_f1, is_factually_consistent
 
 # A minimal AMR string for testing
@@ -27,3 +29,47 @@ def test_binary_consistency_false():
     ok, score = is_factually_consistent(SAME_AMR, [DIFFERENT_AMR], threshold=0.5)
     assert ok is False
     assert 0.0 <= score < 0.5
+
+
+@pytest.mark.parametrize("mode", ["raw", "concept"])
+def test_bulk_matrices_match_scalar_functions(mode):
+    """The N x M matrices agree exactly with smatch_f1 / is_factually_consistent."""
+    import random
+
+    from amrsummarizer.metrics import coverage_matrix, smatch_f1_matrix
+
+    concepts = ["dog", "cat", "bark-01", "sleep-01", "house"]
+    roles = [":ARG0", ":ARG1", ":location"]
+    rng = random.Random(0)
+
+    def random_amr():
+        n = rng.randint(1, 4)
+        parts = [f"(v0 / {rng.choice(concepts)}"]
+        for i in range(1, n):
+            parts.append(f" {rng.choice(roles)} (v{i} / {rng.choice(concepts)})")
+        if rng.random() < 0.5:
+            parts.append(f" :quant {rng.randint(1, 3)}")
+        return "".join(parts) + ")"
+
+    amrs1 = [random_amr() for _ in range(12)] + [SAME_AMR]
+    amrs2 = [random_amr() for _ in range(9)] + [SAME_AMR]
+
+    f1 = smatch_f1_matrix(amrs1, amrs2, mode)
+    coverage = coverage_matrix(amrs1, amrs2, mode)
+    assert f1.shape == coverage.shape == (len(amrs1), len(amrs2))
+    for i, a in enumerate(amrs1):
+        for j, b in enumerate(amrs2):
+            assert f1[i, j] == smatch_f1(a, b, mode)
+            assert coverage[i, j] == is_factually_consistent(a, [b], mode=mode)[1]
+
+
+def test_concept_mode_ignores_variable_names():
+    """Renaming variables drops raw overlap but not concept-anchored overlap."""
+    renamed = "(p / test :arg0 (q / yes) :arg1 (r / zero))"
+    assert smatch_f1(SAME_AMR, renamed, mode="raw") < 1.0
+    assert smatch_f1(SAME_AMR, renamed, mode="concept") == 1.0
+    ok, score = is_factually_consistent(renamed, [SAME_AMR], mode="concept")
+    assert ok is True and score == 1.0
+
+    with pytest.raises(ValueError):
+        smatch_f1(SAME_AMR, renamed, mode="fuzzy")
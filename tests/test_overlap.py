@@ -48,4 +48,94 @@ def test_annotate_and_check_overlap():
     g2_overlap_nodes = [n for n, d in g2.nodes(data=True) if d.get("overlap")]
     g2_overlap_edges = [(u, v) for u, v, d in g2.edges(data=True) if d.get("overlap")]
     print(f"Graph2 overlap nodes: {g2_overlap_nodes}")
-    print(f"Graph2 overlap edges: {g2_overlap_edges}")
\ No newline at end of file
+    print(f"Graph2 overlap edges: {g2_overlap_edges}")
+
+def test_annotate_alignment_from_dict():
+    import networkx as nx
+
+    from amrsummarizer.annotate import annotate_alignment
+
+    g1 = nx.MultiDiGraph()
+    g1.add_edge("w", "b", role=":ARG0")
+    g1.add_edge("w", "b", role=":ARG1")
+    g1.add_edge("w", "g", role=":ARG1")
+    g1.add_node("n")
+    g2 = nx.DiGraph()
+    g2.add_edge("x", "y", role=":ARG0")
+    g2.add_edge("y", "z", role=":mod")
+
+    alignment = {
+        "common_nodes": [["w", "x"], ["b", "y"]],
+        # Inverse roles in the alignment map to the canonical NetworkX edge
+        "common_edges": [[["b", "w", ":ARG0-of"], ["x", "y", ":ARG0"]]],
+    }
+    annotate_alignment(g1, g2, alignment, reset=True)
+
+    assert dict(g1.nodes(data="overlap")) == {"w": True, "b": True, "g": False, "n": False}
+    marked = [(u, v, d["role"]) for u, v, d in g1.edges(data=True) if d["overlap"]]
+    assert marked == [("w", "b", ":ARG0")]
+    assert g2["x"]["y"]["overlap"] is True
+    assert g2["y"]["z"]["overlap"] is False
+
+
+def test_annotate_alignment_only_touches_aligned_elements():
+    import networkx as nx
+
+    from amrsummarizer.annotate import annotate_alignment, build_edge_index
+
+    g1 = nx.MultiDiGraph()
+    g1.add_edge("w", "b", role=":ARG0", color="blue")
+    g1.add_edge("w", "g", role=":ARG1", overlap="keep")
+    g1.nodes["g"]["overlap"] = "keep"
+    g2 = nx.DiGraph()
+    g2.add_edge("x", "y", role=":ARG0")
+    g2.add_edge("y", "z", role=":mod")
+
+    index1, index2 = build_edge_index(g1), build_edge_index(g2)
+    alignment = {
+        "common_nodes": [["w", "x"]],
+        "common_edges": [[["w", "b", ":ARG0"], ["x", "y", ":ARG0"]]],
+    }
+    for _ in range(3):
+        annotate_alignment(g1, g2, alignment, index1=index1, index2=index2)
+
+    # Elements outside the alignment keep whatever they had
+    assert g1.nodes["g"]["overlap"] == "keep"
+    assert "overlap" not in g1.nodes["b"] and "overlap" not in g2.nodes["z"]
+    assert g1["w"]["g"][0]["overlap"] == "keep"
+    assert "overlap" not in g2["y"]["z"]
+    assert g1["w"]["b"][0] == {"role": ":ARG0", "color": "blue", "overlap": True}
+    assert g2.nodes["x"]["overlap"] is True and g2["x"]["y"]["overlap"] is True
+    assert "_edge_index" not in g1.graph
+
+
+def test_annotate_alignment_sees_edits_and_ignores_stale_indexes():
+    import networkx as nx
+
+    from amrsummarizer.annotate import annotate_alignment, build_edge_index
+
+    g1 = nx.DiGraph()
+    g1.add_edge("a", "b", role=":ARG0")
+    g2 = nx.DiGraph()
+    g2.add_edge("x", "y", role=":ARG0")
+    stale = build_edge_index(g1)
+    annotate_alignment(g1, g2, {"common_edges": [[["a", "b", ":ARG0"], ["x", "y", ":ARG0"]]]})
+
+    # Same edge count, different edge: a fresh call sees the new edge
+    g1.remove_edge("a", "b")
+    g1.add_edge("a", "c", role=":ARG0")
+    annotate_alignment(g1, g2, {"common_edges": [[["a", "c", ":ARG0"], ["x", "y", ":ARG0"]]]})
+    assert g1["a"]["c"]["overlap"] is True
+
+    # A stale index skips edges that are gone or whose role changed
+    annotate_alignment(
+        g1, g2, {"common_edges": [[["a", "b", ":ARG0"], ["x", "y", ":ARG0"]]]}, index1=stale
+    )
+    assert not g1.has_edge("a", "b")
+    before_role_change = build_edge_index(g1)
+    g1["a"]["c"].update(role=":ARG1", overlap=False)
+    annotate_alignment(
+        g1, g2, {"common_edges": [[["a", "c", ":ARG0"], ["x", "y", ":ARG0"]]]},
+        index1=before_role_change,
+    )
+    assert g1["a"]["c"]["overlap"] is False
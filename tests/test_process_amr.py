@@ -1,12 +1,26 @@
+import threading
+
 import pytest
 from fastapi.testclient import TestClient
 
 # main.py のモジュールをインポートして、その中の名前をパッチターゲットとする
 from amrsummarizer import main as main_module_under_test 
 from amrsummarizer.main import app # FastAPI アプリケーション
+from amrsummarizer.jobs import JobRunner, JobStore
 
 client = TestClient(app)
 
+
+def stub_parse(fn):
+    """Wrap a texts -> graphs stub so it also reports results through on_result."""
+    def parse(texts, on_result=None):
+        graphs = fn(texts)
+        if on_result is not None:
+            for i, graph in enumerate(graphs):
+                on_result(i, graph)
+        return graphs
+    return parse
+
 @pytest.fixture(autouse=True)
 def stub_all_heavy_processing(monkeypatch):
     """
@@ -14,7 +28,7 @@ def stub_all_heavy_processing(monkeypatch):
     by patching them in the namespace of the module under test (main.py).
     """
 
-    # 1. Stub for parse_amr (main_module_under_test.parse_amr をパッチ)
+    # 1. Stub for parse_amr_batch (main_module_under_test.parse_amr_batch をパッチ)
     class MockAMRGraph: # このスタブの内部構造は、スタブ関数が利用しない限り単純でOK
         def __init__(self, text="dummy amr graph for test"):
             self.text = text
@@ -22,7 +36,11 @@ def stub_all_heavy_processing(monkeypatch):
         def __str__(self):
             return self.text
     dummy_graph_instance = MockAMRGraph()
-    monkeypatch.setattr(main_module_under_test, "parse_amr", lambda text: dummy_graph_instance)
+    monkeypatch.setattr(
+        main_module_under_test,
+        "parse_amr_batch",
+        stub_parse(lambda texts: [dummy_graph_instance for _ in texts]),
+    )
 
     # 2. Stub for amr_to_svg (main_module_under_test.amr_to_svg をパッチ)
     dummy_svg_output = "<svg><text>Stubbed AMR SVG</text></svg>"
@@ -70,4 +88,233 @@ def test_process_amr_consistency_fields():
 
 def test_process_amr_bad_input():
     response = client.post("/process_amr", json={"summary": None, "article": "Test article."})
-    assert response.status_code == 422
\ No newline at end of file
+    assert response.status_code == 422
+
+
+def test_process_amr_overloaded_stage_returns_503(monkeypatch):
+    from amrsummarizer.executors import StageOverloaded
+
+    async def overloaded(stage, fn, *args, **kwargs):
+        raise StageOverloaded(stage, retry_after=2)
+
+    monkeypatch.setattr(main_module_under_test, "run_stage", overloaded)
+    resp = client.post("/process_amr", json={"summary": "Hi.", "article": "Hello world."})
+    assert resp.status_code == 503
+    assert resp.headers["Retry-After"] == "2"
+
+
+def test_render_failure_is_isolated_per_graph(monkeypatch):
+    """A graph that fails to render gets no SVG; the rest of the response is intact."""
+    calls = []
+
+    def flaky_svg(graph_obj):
+        calls.append(graph_obj)
+        if len(calls) == 1:
+            raise RuntimeError("dot crashed")
+        return "<svg>ok</svg>"
+
+    monkeypatch.setattr(main_module_under_test, "amr_to_svg", flaky_svg)
+    resp = client.post(
+        "/process_amr",
+        json={"summary": "Hello world.", "article": "Hello world. Second sentence here."},
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["is_consistent"] is True
+    assert data["render_errors"] == {"summary": "Rendering failed: dot crashed"}
+    assert data["summary_svg"] is None
+    assert all(svg == "<svg>ok</svg>" for svg in data["top_sentence_svgs"].values())
+
+
+def test_graph_output_mode_returns_node_edge_json(monkeypatch):
+    """output="graph" returns node/edge JSON with overlap markers and no SVG."""
+    amrs = {
+        "Dogs bark.": "(b / bark-01 :ARG0 (d / dog) :polarity -)",
+        "Dogs bark loudly.": "(b / bark-01 :ARG0 (d / dog) :manner (l / loud))",
+    }
+    monkeypatch.setattr(main_module_under_test, "parse_amr_batch", stub_parse(lambda texts: [amrs[t] for t in texts]))
+    monkeypatch.setattr(
+        main_module_under_test, "amr_to_svg",
+        lambda graph_obj: pytest.fail("graph mode must not render SVG"),
+    )
+
+    resp = client.post(
+        "/process_amr",
+        json={"summary": "Dogs bark.", "article": "Dogs bark loudly.", "output": "graph"},
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert "summary_svg" not in data
+    summary = data["summary_graph"]
+    assert summary["top"] == "b"
+    assert {(n["id"], n["label"], n["constant"], n["overlap"]) for n in summary["nodes"]} == {
+        ("b", "bark-01", False, True),
+        ("d", "dog", False, True),
+        ("b_:polarity_-", "-", True, False),
+    }
+    assert {(e["source"], e["target"], e["role"], e["overlap"]) for e in summary["edges"]} == {
+        ("b", "d", ":ARG0", True),
+        ("b", "b_:polarity_-", ":polarity", False),
+    }
+    source = data["top_sentence_graphs"]["Dogs bark loudly."]
+    assert {n["id"]: n["overlap"] for n in source["nodes"]} == {"b": True, "d": True, "l": False}
+
+
+def test_unknown_output_mode_is_rejected():
+    resp = client.post("/process_amr", json={"summary": "a", "article": "b", "output": "png"})
+    assert resp.status_code == 422
+
+
+def test_stream_emits_partial_results_then_result():
+    import json
+
+    resp = client.post(
+        "/process_amr/stream",
+        json={"summary": "Hello world.", "article": "Hello world. Second sentence here."},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in resp.text.splitlines()]
+
+    kinds = [e["event"] for e in events]
+    assert kinds[0] == "top_sentences" and kinds[-1] == "result"
+    assert kinds.count("amr") == kinds.count("svg") == 1 + len(events[0]["top_sentences"])
+    # A graph's SVG never arrives before its AMR
+    parsed = set()
+    for e in events:
+        if e["event"] == "amr":
+            parsed.add(e["index"])
+        elif e["event"] == "svg":
+            assert e["index"] in parsed
+            assert e["svg"] == "<svg><text>Stubbed AMR SVG</text></svg>"
+    assert set(events[0]["timings"]) == {"segment", "embed", "retrieve"}
+    assert events[-1]["is_consistent"] is True
+    assert {"parse", "render", "consistency", "total"} <= set(events[-1]["timings"])
+
+
+def test_stream_reports_failures_as_error_event(monkeypatch):
+    import json
+
+    def broken_parse(texts, on_result=None):
+        raise RuntimeError("model crashed")
+
+    monkeypatch.setattr(main_module_under_test, "parse_amr_batch", broken_parse)
+    resp = client.post("/process_amr/stream", json={"summary": "Hello world.", "article": "Hello world."})
+    events = [json.loads(line) for line in resp.text.splitlines()]
+    assert [e["event"] for e in events] == ["top_sentences", "error"]
+    assert "model crashed" in events[-1]["detail"]
+
+
+def test_batch_endpoint_shares_work_across_summaries(monkeypatch):
+    parsed = []
+
+    def counting_parse(texts):
+        parsed.append(list(texts))
+        return [f"(x / {len(t)})" for t in texts]
+
+    monkeypatch.setattr(main_module_under_test, "parse_amr_batch", counting_parse)
+    resp = client.post(
+        "/process_amr_batch",
+        json={
+            "summaries": ["Dogs bark.", "Cats sleep.", "Dogs bark."],
+            "article": "Dogs bark. Cats sleep. Birds sing. Fish swim.",
+        },
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["results"]) == 3
+    assert all(r["is_consistent"] is True and len(r["top_sentences"]) == 3 for r in data["results"])
+    # One parse batch over distinct texts only
+    assert len(parsed) == 1 and len(parsed[0]) == len(set(parsed[0]))
+    reuse = data["reuse"]
+    assert reuse["summaries"] == 3 and reuse["retrieved_sentences"] == 9
+    assert reuse["parsed_texts"] == len(parsed[0])
+    assert reuse["parses_saved"] == 3 + 9 - len(parsed[0]) > 0
+
+
+def test_batch_endpoint_validates_summaries():
+    article = "Dogs bark. Cats sleep."
+    assert client.post("/process_amr_batch", json={"summaries": [], "article": article}).status_code == 400
+    resp = client.post("/process_amr_batch", json={"summaries": ["ok", " "], "article": article})
+    assert resp.status_code == 400
+
+
+def test_timing_header_breaks_down_stages():
+    payload = {"summary": "Hello world.", "article": "Hello world. Goodbye world."}
+    assert "X-Timing" not in client.post("/process_amr", json=payload).headers
+
+    resp = client.post("/process_amr", json=payload, headers={"X-Timing": "1"})
+    assert resp.status_code == 200
+    stages = [part.split(";")[0] for part in resp.headers["X-Timing"].split(", ")]
+    for stage in ("segment", "embed", "retrieve", "parse", "render", "consistency"):
+        assert stage in stages
+    assert stages[-1] == "total"
+
+
+def test_metrics_endpoint_exposes_prometheus_text(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        main_module_under_test, "_job_runner",
+        JobRunner(JobStore(str(tmp_path / "jobs.sqlite3")), lambda summary, article: {}),
+    )
+    client.post("/process_amr", json={"summary": "Hello world.", "article": "Hello world."})
+    client.get("/jobs/unknown-job")
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'amr_stage_seconds_count{stage="parse"}' in body
+    assert 'amr_stage_seconds_bucket{stage="consistency",le="+Inf"}' in body
+    assert 'amr_requests_total{endpoint="/process_amr",status="200"}' in body
+    # Labelled by route template, not by the requested path
+    assert 'amr_requests_total{endpoint="/jobs/{job_id}",status="404"}' in body
+    assert "amr_requests_in_flight 1" in body  # the /metrics request itself
+    assert 'amr_cache_hit_ratio{cache="parse"}' in body
+    assert 'amr_stage_in_flight{stage="parse"} 0' in body
+
+
+def test_sentence_index_is_loaded_off_the_event_loop(monkeypatch):
+    loaded_on = []
+
+    class FakeIndex:
+        def query(self, embedding, k):
+            return [(["corpus sentence"], [0.5])]
+
+    def fake_load(path):
+        loaded_on.append(threading.current_thread().name)
+        return FakeIndex()
+
+    monkeypatch.setattr(main_module_under_test, "SENTENCE_INDEX_PATH", "/data/index")
+    monkeypatch.setattr(main_module_under_test, "_sentence_index", None)
+    monkeypatch.setattr(main_module_under_test.SentenceIndex, "load", staticmethod(fake_load))
+    assert client.get("/ready").json()["models"]["sentence_index"] is False
+
+    resp = client.post("/process_article", json={"summary": "Hello.", "article": "Hello world."})
+    assert resp.status_code == 200
+    assert resp.json()["corpus_sentences"] == ["corpus sentence"]
+    assert len(loaded_on) == 1 and loaded_on[0].startswith("amr-retrieve")
+    assert client.get("/ready").json()["models"]["sentence_index"] is True
+
+
+def test_stream_parses_all_texts_in_one_call(monkeypatch):
+    import json
+
+    calls = []
+
+    def counting_parse(texts, on_result=None):
+        calls.append(list(texts))
+        return stub_parse(lambda texts: [f"(x / {len(t)})" for t in texts])(texts, on_result)
+
+    monkeypatch.setattr(main_module_under_test, "parse_amr_batch", counting_parse)
+    resp = client.post(
+        "/process_amr/stream",
+        json={"summary": "Hello world.", "article": "Hello world. Second one. Third one here."},
+    )
+    events = [json.loads(line) for line in resp.text.splitlines()]
+    # One parse slot per stream, however many texts it parses
+    assert len(calls) == 1 and len(calls[0]) == 1 + len(events[0]["top_sentences"])
+    assert sorted(e["index"] for e in events if e["event"] == "amr") == list(range(len(calls[0])))
+    assert events[-1]["event"] == "result"
@@ -0,0 +1,67 @@
+import json
+
+import numpy as np
+
+from amrsummarizer import consistency, score_corpus
+from amrsummarizer.score_corpus import load_checkpoint, read_pairs
+
+SUMMARY_AMR = "(b / bark-01 :ARG0 (d / dog))"
+
+
+def test_read_pairs_jsonl_and_tsv(tmp_path):
+    jsonl = tmp_path / "pairs.jsonl"
+    jsonl.write_text(
+        json.dumps({"id": "a", "summary": "S1", "article": "A1"}) + "\n"
+        + json.dumps({"summary": "S2", "article": "A2"}) + "\n"
+    )
+    tsv = tmp_path / "pairs.tsv"
+    tsv.write_text("x\tS1\tA1\nS2\tA2\n")
+
+    assert list(read_pairs(str(jsonl))) == [("a", "S1", "A1"), ("1", "S2", "A2")]
+    assert list(read_pairs(str(tsv))) == [("x", "S1", "A1"), ("1", "S2", "A2")]
+
+
+def test_load_checkpoint_drops_truncated_last_line(tmp_path):
+    out = tmp_path / "scores.jsonl"
+    out.write_text('{"id": "a", "is_consistent": true}\n{"id": "b", "is_cons')
+
+    assert load_checkpoint(str(out)) == {"a"}
+    assert out.read_text() == '{"id": "a", "is_consistent": true}\n'
+
+
+def test_check_consistency_many_batches_work(monkeypatch):
+    embed_calls, parse_calls = [], []
+
+    def fake_embeddings(texts):
+        embed_calls.append(list(texts))
+        return np.array([[1.0, float(len(t))] for t in texts])
+
+    def fake_parse(texts):
+        parse_calls.append(list(texts))
+        return [SUMMARY_AMR for _ in texts]
+
+    monkeypatch.setattr(consistency, "segment_many", lambda texts: [t.split(". ") for t in texts])
+    monkeypatch.setattr(consistency, "get_embeddings", fake_embeddings)
+    monkeypatch.setattr(consistency, "parse_amr_batch", fake_parse)
+
+    results = consistency.check_consistency_many(
+        [("Dogs bark", "Dogs bark. Cats sleep"), ("", "Anything"), ("Birds", "Birds sing")],
+        k=1,
+    )
+
+    assert len(embed_calls) == 1 and len(parse_calls) == 1
+    assert results[0]["is_consistent"] is True
+    assert results[0]["smatch_f1"] == 1.0
+    assert results[1] == {"error": "Summary is required."}
+    assert results[2]["top_sentences"] == ["Birds sing"]
+
+
+def test_score_chunk_attaches_ids(monkeypatch):
+    monkeypatch.setattr(
+        score_corpus, "check_consistency_many",
+        lambda pairs, **kwargs: [{"is_consistent": True} for _ in pairs],
+    )
+    assert score_corpus._score_chunk([("a", "S", "A"), ("b", "S", "A")]) == [
+        {"id": "a", "is_consistent": True},
+        {"id": "b", "is_consistent": True},
+    ]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from amrsummarizer.sentence_index import SentenceIndex
+
+
+def _corpus(n=500, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    sentences = [f"sentence {i}" for i in range(n)]
+    return sentences, vectors
+
+
+def _brute_force(vectors, query, k):
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = unit @ (query / np.linalg.norm(query))
+    return list(np.argsort(-scores)[:k])
+
+
+def test_exact_query_matches_brute_force():
+    sentences, vectors = _corpus()
+    index = SentenceIndex(dim=16)
+    index.add(sentences[:200], vectors[:200])
+    index.add(sentences[200:], vectors[200:])
+
+    [(found, scores)] = index.query(vectors[42], k=5)
+    assert found == [sentences[i] for i in _brute_force(vectors, vectors[42], 5)]
+    assert found[0] == "sentence 42"
+    assert scores[0] == pytest.approx(1.0, abs=1e-5)
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_save_load_and_incremental_add(tmp_path):
+    sentences, vectors = _corpus()
+    index = SentenceIndex(dim=16, dtype="float16")
+    index.add(sentences[:300], vectors[:300])
+    index.save(str(tmp_path / "idx"))
+
+    loaded = SentenceIndex.load(str(tmp_path / "idx"))
+    assert isinstance(loaded._stored, np.memmap)
+    loaded.add(sentences[300:], vectors[300:], doc_ids=["doc-b"] * 200)
+    [(found, _)] = loaded.query(vectors[450], k=1)
+    assert found == ["sentence 450"]
+
+    # Saving back to the same directory appends only the new sentences
+    loaded.save()
+    reloaded = SentenceIndex.load(str(tmp_path / "idx"))
+    assert len(reloaded) == 500
+    assert reloaded.doc_ids[450] == "doc-b"
+    [(found, _)] = reloaded.query(vectors[10], k=1)
+    assert found == ["sentence 10"]
+
+
+def test_ivf_with_all_buckets_probed_equals_exact(tmp_path):
+    sentences, vectors = _corpus()
+    index = SentenceIndex(dim=16)
+    index.add(sentences, vectors)
+    exact = index.query(vectors[:3], k=4)
+
+    index.train(nlist=10)
+    for (found, scores), (exact_found, exact_scores) in zip(
+        index.query(vectors[:3], k=4, nprobe=10), exact
+    ):
+        assert found == exact_found
+        assert scores == pytest.approx(exact_scores)
+    # A narrow probe still finds each query's own sentence
+    for i, (found, _) in enumerate(index.query(vectors[:3], k=1, nprobe=2)):
+        assert found == [f"sentence {i}"]
+
+    index.save(str(tmp_path / "ivf"))
+    loaded = SentenceIndex.load(str(tmp_path / "ivf"))
+    assert loaded.backend == "ivf" and loaded.is_trained
+    loaded.add(["new sentence"], vectors[:1] * -1)
+    [(found, _)] = loaded.query(vectors[0] * -1, k=1, nprobe=10)
+    assert found == ["new sentence"]
@@ -0,0 +1,99 @@
+import pytest
+
+from amrsummarizer.smatch_ext import compare_amr
+
+AMR1 = "(w / want-01 :ARG0 (b / boy) :ARG1 (g / go-02 :ARG0 b))"
+AMR2 = "(x / want-01 :ARG0 (y / boy) :ARG1 (z / go-02 :ARG0 y :ARG4 (c / city)))"
+
+
+@pytest.mark.parametrize("solver", ["ilp", "hillclimb", "budget"])
+def test_solvers_find_the_same_alignment(solver):
+    result = compare_amr(AMR1, AMR2, solver=solver)
+    assert sorted(result["common_nodes"]) == [["b", "y"], ["g", "z"], ["w", "x"]]
+    assert len(result["common_edges"]) == 3
+
+    stats = result["alignment"]
+    assert stats["solver"] == solver
+    assert stats["matched_triples"] == compare_amr(AMR1, AMR2, solver="ilp")["alignment"]["matched_triples"]
+    assert stats["seconds"] >= 0
+
+
+def test_ilp_reports_a_proven_optimum():
+    stats = compare_amr(AMR1, AMR2, solver="ilp")["alignment"]
+    assert stats["optimal"] is True
+    assert stats["upper_bound"] == stats["matched_triples"]
+    assert compare_amr(AMR1, AMR2, solver="hillclimb")["alignment"]["upper_bound"] is None
+
+
+def test_unknown_solver():
+    with pytest.raises(ValueError):
+        compare_amr(AMR1, AMR2, solver="annealing")
+
+
+def test_compare_many_keeps_input_order():
+    from amrsummarizer.smatch_ext import Aligner
+
+    pairs = [(AMR1, AMR2), (AMR2, AMR1), ("(a / alpha)", AMR1), (AMR1, AMR1)]
+    with Aligner(solver="ilp", workers=2, cache=False) as aligner:
+        sequential = [aligner.compare(a, b) for a, b in pairs]
+        parallel = aligner.compare_many(pairs)
+
+    def strip(result):
+        return {k: v for k, v in result.items() if k != "alignment"}
+
+    assert [strip(r) for r in parallel] == [strip(r) for r in sequential]
+    assert [r["alignment"]["matched_triples"] for r in parallel] == [
+        r["alignment"]["matched_triples"] for r in sequential
+    ]
+
+
+def test_align_corpus_streams_multi_graph_files(tmp_path):
+    import json
+
+    from amrsummarizer.smatch_ext import Aligner, align_corpus, iter_graph_pairs
+
+    (tmp_path / "a.amr").write_text(f"# ::id first\n{AMR1}\n\n(a / alpha)\n\n(b / beta)\n")
+    (tmp_path / "b.amr").write_text(f"{AMR2}\n\n(a / alpha)\n")
+    output = tmp_path / "alignments.jsonl"
+
+    records = iter_graph_pairs(str(tmp_path / "a.amr"), str(tmp_path / "b.amr"))
+    written, failed = align_corpus(records, str(output), Aligner("hillclimb"), window=1)
+
+    lines = [json.loads(line) for line in output.read_text().splitlines()]
+    assert (written, failed) == (2, 0)
+    assert [line["id"] for line in lines] == ["first", "1"]
+    assert len(lines[0]["common_edges"]) == 3
+    assert lines[1]["common_nodes"] == [["a", "a"]]
+
+
+def test_alignment_cache_is_keyed_by_graph_and_settings(tmp_path, monkeypatch):
+    from amrsummarizer.cache import TieredCache
+    from amrsummarizer.smatch_ext import Aligner
+
+    cache = TieredCache(16, str(tmp_path / "alignments.sqlite"), table="alignments")
+    calls = []
+    original = Aligner._align
+
+    def counting_align(self, amr1, amr2):
+        calls.append(self.solver)
+        return original(self, amr1, amr2)
+
+    monkeypatch.setattr(Aligner, "_align", counting_align)
+
+    aligner = Aligner("ilp", cache=cache)
+    first = aligner.compare(AMR1, AMR2)
+    # Same graphs in a different layout hit the cache
+    reformatted = "(w / want-01\n   :ARG1 (g / go-02 :ARG0 b)\n   :ARG0 (b / boy))"
+    assert aligner.compare(reformatted, AMR2) == first
+    assert calls == ["ilp"]
+
+    # Other solver settings are a different entry
+    Aligner("hillclimb", cache=cache).compare(AMR1, AMR2)
+    Aligner("hillclimb", restarts=2, cache=cache).compare(AMR1, AMR2)
+    assert calls == ["ilp", "hillclimb", "hillclimb"]
+
+    # The SQLite tier survives a fresh memory tier
+    cache.clear()
+    assert Aligner("ilp", cache=cache).compare(AMR1, AMR2) == first
+    assert len(calls) == 3
+    assert cache.stats()["disk_hits"] == 1
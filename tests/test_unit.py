@@ -1,8 +1,12 @@
 import numpy as np
 import pytest
 
-from amrsummarizer.pipeline import segment_sentences
-from amrsummarizer.similarity import top_k_sentences
+from amrsummarizer.pipeline import segment_sentences, segment_many
+from amrsummarizer.similarity import (
+    cosine_similarity,
+    top_k_sentences,
+    top_k_sentences_batch,
+)
 from amrsummarizer.amr_parser import parse_amr
 
 def test_segment_sentences_basic():
@@ -14,6 +18,28 @@ def test_segment_sentences_basic():
     assert segment_sentences(text) == expected
 
 
+def test_segment_sentences_regex_mode():
+    """
+    Unit test: the regex backend splits on terminal punctuation
+    but not after common abbreviations.
+    """
+    text = 'Mr. Smith met Dr. Jones. He said "Stop." Then he left!'
+    expected = ["Mr. Smith met Dr. Jones.", 'He said "Stop."', "Then he left!"]
+    assert segment_sentences(text, mode="regex") == expected
+
+
+def test_segment_many_matches_single_documents():
+    """
+    Unit test: batched segmentation returns the same sentences as
+    segmenting each document on its own.
+    """
+    docs = ["One here. Two here.", "Three here!", ""]
+    for mode in ("sentencizer", "regex"):
+        assert segment_many(docs, mode=mode) == [
+            segment_sentences(doc, mode=mode) for doc in docs
+        ]
+
+
 def test_top_k_sentences_simple_sorting():
     """
     Unit test: top_k_sentences should select the top-k most similar sentences
@@ -34,6 +60,50 @@ def test_top_k_sentences_simple_sorting():
     assert pytest.approx(scores[0], rel=1e-3) == 1.0
 
 
+def _reference_top_k(summary_emb, sent_embs, sents, k):
+    """
+    The original per-sentence implementation of top_k_sentences
+    (with a stable sort, so the order of tied scores is well defined).
+    """
+    similarities = [cosine_similarity(summary_emb, e) for e in sent_embs]
+    top_indices = np.argsort(similarities, kind="stable")[-k:][::-1]
+    return [sents[i] for i in top_indices], [float(similarities[i]) for i in top_indices]
+
+
+@pytest.mark.parametrize("k", [1, 3, 50, 500])
+def test_top_k_sentences_matches_reference(k):
+    """
+    Unit test: the vectorized selection returns the same sentences, in the
+    same order, as the per-sentence loop (including ties and k > n).
+    """
+    rng = np.random.default_rng(0)
+    sent_embs = rng.normal(size=(200, 16)).astype(np.float32)
+    sent_embs[50:60] = sent_embs[7]  # a block of tied sentences
+    sents = [f"s{i}" for i in range(len(sent_embs))]
+    summary_emb = sent_embs[7] + 0.01
+
+    top_sents, scores = top_k_sentences(summary_emb, sent_embs, sents, k=k)
+    ref_sents, ref_scores = _reference_top_k(summary_emb, sent_embs, sents, k)
+    assert top_sents == ref_sents
+    assert scores == pytest.approx(ref_scores, abs=1e-6)
+
+
+def test_top_k_sentences_batch_matches_single_calls():
+    """
+    Unit test: scoring several summaries at once equals one call per summary.
+    """
+    rng = np.random.default_rng(1)
+    sent_embs = rng.normal(size=(30, 8))
+    summaries = rng.normal(size=(4, 8))
+    sents = [f"s{i}" for i in range(30)]
+
+    batched = top_k_sentences_batch(summaries, sent_embs, sents, k=3)
+    for (top_sents, scores), summary in zip(batched, summaries):
+        single_sents, single_scores = top_k_sentences(summary, sent_embs, sents, k=3)
+        assert top_sents == single_sents
+        assert scores == pytest.approx(single_scores, abs=1e-12)
+
+
 def test_parse_amr_contains_buy():
     """
     Unit test: parse_amr should return a Penman-formatted string
@@ -0,0 +1,48 @@
+import shutil
+
+import networkx as nx
+import pytest
+
+from amrsummarizer import visualizer
+from amrsummarizer.visualizer import graph_to_dot, render_many, render_svg
+
+
+def annotated_graph():
+    G = nx.DiGraph()
+    G.add_node("w", label="want-01", overlap=True)
+    G.add_node("b", label="boy", overlap=False)
+    G.add_node('"Bob"', label='"Bob"', is_constant=True, overlap=False)
+    G.add_edge("w", "b", role=":ARG0", overlap=True)
+    G.add_edge("b", '"Bob"', role=":name", overlap=False)
+    return G
+
+
+def test_graph_to_dot_styles_overlap_and_quotes_ids():
+    dot = graph_to_dot(annotated_graph())
+    assert dot.startswith('digraph "G" {')
+    assert '"w" [label="want-01", color="red", style="filled", fillcolor="pink"];' in dot
+    assert '"b" [label="boy", color="grey"];' in dot
+    assert '"\\"Bob\\"" [label="\\"Bob\\"", color="grey"];' in dot
+    assert '"w" -> "b" [color="red", penwidth="2"];' in dot
+    assert '"b" -> "\\"Bob\\"" [color="grey", penwidth="1"];' in dot
+
+
+def test_render_many_splits_one_graphviz_call(monkeypatch):
+    calls = []
+
+    def fake_dot(dot_text):
+        calls.append(dot_text)
+        return b'<?xml version="1.0"?><svg>1</svg>\n<?xml version="1.0"?><svg>2</svg>\n'
+
+    monkeypatch.setattr(visualizer, "_run_dot", fake_dot)
+    svgs = render_many([annotated_graph(), annotated_graph()])
+
+    assert len(calls) == 1 and calls[0].count("digraph") == 2
+    assert svgs == [b'<?xml version="1.0"?><svg>1</svg>\n', b'<?xml version="1.0"?><svg>2</svg>\n']
+
+
+@pytest.mark.skipif(shutil.which(visualizer.DOT_BINARY) is None, reason="Graphviz not installed")
+def test_render_svg_with_graphviz():
+    svg = render_svg(annotated_graph())
+    assert b"<svg" in svg and b"want-01" in svg
+    assert len(render_many([annotated_graph()] * 3)) == 3